@@ -1,4 +1,10 @@
 import asyncio
+import hashlib
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+
 import discord
 from discord.ext import commands
 from discord import app_commands
@@ -6,7 +12,10 @@ from discord import app_commands
 import config
 import database as db
 import cache_manager
+import ytdl_source
+
 
+logger = logging.getLogger(__name__)
 
 intents = discord.Intents.default()
 intents.voice_states = True
@@ -14,19 +23,80 @@ intents.voice_states = True
 bot = commands.Bot(command_prefix="!", intents=intents)
 
 
+# Signature of the last synced command tree — syncing is rate limited, so
+# only push the tree to Discord when the commands actually changed.
+SYNC_STAMP_PATH = Path(__file__).parent / ".command_sync"
+
+_touch_flush_task: asyncio.Task | None = None
+
+
+def _setup_logging() -> QueueListener:
+    """
+    Route every log record through a queue drained by a listener thread,
+    so handlers never write to stderr from the event loop.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)-8s %(name)s: %(message)s")
+    )
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def _command_tree_signature() -> str:
+    """
+    Hash of every registered slash command: description, permissions and
+    flags, and each parameter's type, choices and limits.
+    """
+    parts = [f"guild={config.GUILD_ID}"]
+    for cmd in sorted(bot.tree.walk_commands(), key=lambda c: c.qualified_name):
+        params = ",".join(
+            f"{p.name}:{p.type}:{p.required}:{p.description}"
+            f":{[(c.name, c.value) for c in p.choices]}"
+            f":{p.min_value}:{p.max_value}:{p.channel_types}:{p.autocomplete}"
+            for p in getattr(cmd, "parameters", [])
+        )
+        perms = getattr(cmd, "default_permissions", None)
+        parts.append(
+            f"{cmd.qualified_name}|{cmd.description}"
+            f"|perms={perms.value if perms else None}"
+            f"|guild_only={getattr(cmd, 'guild_only', False)}"
+            f"|nsfw={getattr(cmd, 'nsfw', False)}|{params}"
+        )
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
 @bot.event
-async def on_ready():
+async def setup_hook():
+    """Runs once per process (not on every reconnect like on_ready)."""
+    global _touch_flush_task
     db.init_db()
     cache_manager.ensure_cache_dir()
+    _touch_flush_task = asyncio.create_task(cache_manager.flush_touches_periodically())
+
+    signature = _command_tree_signature()
+    if SYNC_STAMP_PATH.exists() and SYNC_STAMP_PATH.read_text().strip() == signature:
+        logger.info("Slash commands unchanged since last sync; skipping sync.")
+        return
     if config.GUILD_ID:
         guild = discord.Object(id=config.GUILD_ID)
         bot.tree.copy_global_to(guild=guild)
         await bot.tree.sync(guild=guild)
-        print(f"Slash commands synced to guild {config.GUILD_ID} (instant).")
+        logger.info("Slash commands synced to guild %s (instant).", config.GUILD_ID)
     else:
         await bot.tree.sync()
-        print("Slash commands synced globally (up to 1 hour to propagate).")
-    print(f"Logged in as {bot.user} (ID: {bot.user.id})")
+        logger.info("Slash commands synced globally (up to 1 hour to propagate).")
+    SYNC_STAMP_PATH.write_text(signature)
+
+
+@bot.event
+async def on_ready():
+    logger.info("Logged in as %s (ID: %s)", bot.user, bot.user.id)
 
 
 @bot.tree.error
@@ -40,7 +110,7 @@ async def on_app_command_error(
         if isinstance(inner, ValueError):
             msg = str(inner)
         else:
-            print(f"[ERROR] {type(inner).__name__}: {inner}")
+            logger.error("%s: %s", type(inner).__name__, inner)
     if interaction.response.is_done():
         await interaction.followup.send(msg, ephemeral=True)
     else:
@@ -48,11 +118,23 @@ async def on_app_command_error(
 
 
 async def main():
-    async with bot:
-        await bot.load_extension("cogs.music")
-        await bot.load_extension("cogs.playlist")
-        await bot.load_extension("cogs.cache")
-        await bot.start(config.DISCORD_TOKEN)
+    listener = _setup_logging()
+    try:
+        async with bot:
+            await bot.load_extension("cogs.music")
+            await bot.load_extension("cogs.playlist")
+            await bot.load_extension("cogs.cache")
+            try:
+                await bot.start(config.DISCORD_TOKEN)
+            finally:
+                cache_manager.flush_touches()
+                cache_manager.shutdown_download_pool()
+                ytdl_source.shutdown_pools()
+    finally:
+        # After the bot has closed, so shutdown messages are still written
+        listener.stop()
 
 
-asyncio.run(main())
+# Guarded so spawned download workers can import this module safely
+if __name__ == "__main__":
+    asyncio.run(main())
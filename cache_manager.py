@@ -1,5 +1,12 @@
+import asyncio
 import os
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import Iterable
 import hashlib
 
 import database as db
@@ -7,17 +14,53 @@ import database as db
 CACHE_DIR = Path(__file__).parent / "audio_cache"
 MAX_CACHE_SIZE_MB = 2000  # 2 GB
 
+# Dedicated worker processes for /cache downloads — ffmpeg encoding is
+# CPU-bound, so give it one process per core instead of the default thread
+# pool. Uses spawn so workers aren't forked from the threaded bot process.
+# Created on first use: spawned children re-import this module (and the
+# bot's main module) and must not build pools of their own.
+_download_pool: ProcessPoolExecutor | None = None
 
+
+def get_download_pool() -> ProcessPoolExecutor:
+    """The /cache download worker pool, started on first use."""
+    global _download_pool
+    if _download_pool is None:
+        _download_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _download_pool
+
+
+def shutdown_download_pool() -> None:
+    if _download_pool is not None:
+        _download_pool.shutdown(wait=False, cancel_futures=True)
+
+# last_played updates are buffered here (url -> unix time) and written in
+# one batch every TOUCH_FLUSH_INTERVAL seconds instead of once per play.
+TOUCH_FLUSH_INTERVAL = 30  # seconds
+_pending_touches: dict[str, float] = {}
+# Plays are recorded on the event loop; flushes may run on a worker thread
+_touch_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4096)
 def url_to_hash(url: str) -> str:
-    """Deterministic short hash of a canonical URL for use as a filename."""
-    return hashlib.sha256(url.encode()).hexdigest()[:16]
+    """Deterministic short hash of a canonical URL for use as a filename.
+
+    Not security-sensitive, so BLAKE2b with an 8-byte digest is used: same
+    16-char width as before, without hashing a full SHA-256 and truncating.
+    """
+    return hashlib.blake2b(url.encode(), digest_size=8).hexdigest()
 
 
 def get_cached_path(url: str) -> str | None:
     """Return the local file path if this URL is cached and the file exists."""
     row = db.get_cached_track(url)
     if row and os.path.isfile(row["file_path"]):
-        db.touch_cached_track(url)
+        with _touch_lock:
+            _pending_touches[url] = time.time()
         return row["file_path"]
     # DB row exists but file was deleted externally — clean up
     if row:
@@ -25,6 +68,22 @@ def get_cached_path(url: str) -> str | None:
     return None
 
 
+def existing_files(paths: Iterable[str]) -> set[str]:
+    """Return the subset of paths that exist, using one scandir per directory."""
+    by_dir: dict[str, list[str]] = {}
+    for path in paths:
+        by_dir.setdefault(os.path.dirname(path), []).append(path)
+    found = set()
+    for parent, wanted in by_dir.items():
+        try:
+            with os.scandir(parent or ".") as it:
+                names = {entry.name for entry in it if entry.is_file()}
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        found.update(p for p in wanted if os.path.basename(p) in names)
+    return found
+
+
 def register_cached_file(
     url: str, file_path: str, title: str, duration: int
 ) -> None:
@@ -34,20 +93,36 @@ def register_cached_file(
     enforce_cache_limit()
 
 
+def flush_touches() -> None:
+    """Write buffered last_played timestamps to the DB in one transaction."""
+    global _pending_touches
+    with _touch_lock:
+        if not _pending_touches:
+            return
+        pending, _pending_touches = _pending_touches, {}
+    db.touch_cached_tracks([(ts, url) for url, ts in pending.items()])
+
+
+async def flush_touches_periodically() -> None:
+    """Background task: flush buffered touches every TOUCH_FLUSH_INTERVAL seconds."""
+    while True:
+        await asyncio.sleep(TOUCH_FLUSH_INTERVAL)
+        # The write may wait on the writer lock behind an eviction pass
+        await asyncio.to_thread(flush_touches)
+
+
 def enforce_cache_limit() -> None:
     """Evict least-recently-played tracks until cache is under the size limit."""
+    flush_touches()  # eviction order depends on up-to-date last_played
     max_bytes = MAX_CACHE_SIZE_MB * 1024 * 1024
     total = db.get_total_cache_size()
     if total <= max_bytes:
         return
-    for track in db.get_all_cached_tracks():
-        if total <= max_bytes:
-            break
+    for track in db.get_cache_eviction_candidates(total - max_bytes):
         try:
             os.remove(track["file_path"])
         except FileNotFoundError:
             pass
-        total -= track["file_size"]
         db.delete_cached_track(track["url"])
 
 
@@ -1,29 +1,27 @@
 import asyncio
+import logging
 import os
+import re
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
 import cache_manager
+import config
 import database as db
-from queue_manager import queue_manager, SongEntry
-from ytdl_source import YTDLSource, _download_single_track, _extract_playlist, LOCAL_FFMPEG_OPTIONS
+from queue_manager import queue_manager, SongEntry, is_active
+from ytdl_source import (
+    PLAYLIST_TIMEOUT, RESOLVE_SEMAPHORE, YTDL_POOL, YTDLSource, _download_single_track,
+    _extract_playlist_flat, LOCAL_FFMPEG_OPTIONS,
+)
 
 
-CACHE_PLAYLIST_DIR = cache_manager.CACHE_DIR / "playlists"
-
-
-def _ensure_playlist_cache_dir():
-    CACHE_PLAYLIST_DIR.mkdir(parents=True, exist_ok=True)
+logger = logging.getLogger(__name__)
 
+CACHE_PLAYLIST_DIR = cache_manager.CACHE_DIR / "playlists"
 
-def _fmt_duration(seconds: int) -> str:
-    minutes, secs = divmod(seconds, 60)
-    hours, minutes = divmod(minutes, 60)
-    if hours:
-        return f"{hours}:{minutes:02d}:{secs:02d}"
-    return f"{minutes}:{secs:02d}"
+_SC_SET_RE = re.compile(r"^https?://(?:www\.|m\.)?soundcloud\.com/[^/]+/sets/")
 
 
 class CacheCog(commands.Cog):
@@ -40,7 +38,7 @@ class CacheCog(commands.Cog):
     )
     async def cache_playlist(self, interaction: discord.Interaction, url: str, name: str):
         # Validate it's a SoundCloud playlist
-        if "soundcloud.com" not in url or "/sets/" not in url:
+        if not _SC_SET_RE.match(url):
             await interaction.response.send_message(
                 "Only SoundCloud playlist URLs (containing `/sets/`) are supported.",
                 ephemeral=True,
@@ -48,15 +46,20 @@ class CacheCog(commands.Cog):
             return
 
         await interaction.response.defer(thinking=True)
-        _ensure_playlist_cache_dir()
 
         guild_id = str(interaction.guild_id)
 
-        # Fetch playlist metadata
+        # Fetch the track list only; per-track metadata is resolved by the
+        # download workers in parallel
         try:
-            data = await self.bot.loop.run_in_executor(
-                None, lambda: _extract_playlist(url)
-            )
+            async with RESOLVE_SEMAPHORE:
+                data = await asyncio.wait_for(
+                    self.bot.loop.run_in_executor(YTDL_POOL, _extract_playlist_flat, url),
+                    PLAYLIST_TIMEOUT,
+                )
+        except asyncio.TimeoutError:
+            await interaction.followup.send("Timed out fetching the playlist.")
+            return
         except Exception as exc:
             await interaction.followup.send(f"Failed to fetch playlist: {exc}")
             return
@@ -71,12 +74,11 @@ class CacheCog(commands.Cog):
         already_cached = db.get_cached_playlist_urls(playlist_id)
         next_pos = db.get_next_cached_track_position(playlist_id)
 
-        # Filter to only new tracks
-        new_entries = []
-        for entry in entries:
-            track_url = entry.get("webpage_url") or entry.get("url")
-            if track_url and track_url not in already_cached:
-                new_entries.append(entry)
+        # Filter to only new tracks (already_cached is a set: O(1) per check)
+        new_entries = [
+            e for e in entries
+            if (u := e.get("webpage_url") or e.get("url")) and u not in already_cached
+        ]
 
         if not new_entries:
             await interaction.followup.send(
@@ -91,49 +93,85 @@ class CacheCog(commands.Cog):
             wait=True,
         )
 
-        # Download each new track
+        # Download new tracks concurrently, bounded by CACHE_CONCURRENCY
         cached_count = 0
         failed_count = 0
+        # Only created once there's something to download
         playlist_dir = CACHE_PLAYLIST_DIR / f"{guild_id}_{playlist_id}"
         playlist_dir.mkdir(parents=True, exist_ok=True)
+        sem = asyncio.BoundedSemaphore(config.CACHE_CONCURRENCY)
+        # One directory read instead of a stat per track
+        with os.scandir(playlist_dir) as it:
+            on_disk = {e.name for e in it}
 
-        for i, entry in enumerate(new_entries):
+        async def _download(pos: int, entry: dict) -> tuple[int, dict, str | None]:
+            """Download one track. Returns (position, entry, path or None on failure)."""
             track_url = entry.get("webpage_url") or entry.get("url")
-            title = entry.get("title", "Unknown")
-            duration = int(entry.get("duration") or 0)
 
             # Deterministic filename from URL
-            file_hash = cache_manager.url_to_hash(track_url)
-            output_path = str(playlist_dir / f"{file_hash}.opus")
-
-            # Skip if file already exists on disk (e.g. partial re-run)
-            if os.path.isfile(output_path):
-                db.add_cached_playlist_track(
-                    playlist_id, next_pos, title, track_url, duration, output_path
-                )
-                next_pos += 1
-                cached_count += 1
-                continue
-
-            try:
-                result = await self.bot.loop.run_in_executor(
-                    None, lambda u=track_url, o=output_path: _download_single_track(u, o)
-                )
-                actual_path = result.get("_downloaded_file", output_path)
-                if os.path.isfile(actual_path):
-                    db.add_cached_playlist_track(
-                        playlist_id, next_pos, title, track_url, duration, actual_path
-                    )
-                    next_pos += 1
-                    cached_count += 1
+            filename = f"{cache_manager.url_to_hash(track_url)}.opus"
+            output_path = str(playlist_dir / filename)
+
+            # Skip the download if the file already exists on disk (e.g. a
+            # partial re-run), but still give its row real metadata
+            if filename in on_disk:
+                if entry.get("title") and entry.get("duration"):
+                    return pos, entry, output_path
+                row = db.get_cached_track(track_url)
+                if row is not None:
+                    meta = {"title": row["title"], "duration": row["duration"]}
                 else:
-                    failed_count += 1
-            except Exception as exc:
-                print(f"[cache] Failed to download '{title}': {exc}")
+                    try:
+                        async with sem:
+                            found = await YTDLSource.fetch_metadata_only(track_url)
+                        meta = {"title": found["title"], "duration": found["duration"]}
+                    except Exception as exc:
+                        logger.warning("Could not look up %s: %s", track_url, exc)
+                        return pos, entry, output_path
+                return pos, {**entry, **meta}, output_path
+
+            async with sem:
+                try:
+                    result = await self.bot.loop.run_in_executor(
+                        cache_manager.get_download_pool(), _download_single_track,
+                        track_url, output_path, entry,
+                    )
+                except Exception as exc:
+                    logger.warning("Failed to download %r: %s", entry.get("title", "Unknown"), exc)
+                    return pos, entry, None
+            # Flat playlist entries lack full metadata; take it from the download
+            entry = {
+                **entry,
+                "title": result.get("title") or entry.get("title", "Unknown"),
+                "duration": result.get("duration") or entry.get("duration"),
+            }
+            return pos, entry, result["_downloaded_file"]
+
+        # Positions follow playlist order regardless of completion order
+        tasks = [
+            asyncio.create_task(_download(next_pos + i, entry))
+            for i, entry in enumerate(new_entries)
+        ]
+
+        # DB writes and progress edits stay on this coroutine; rows are
+        # buffered and flushed in one transaction per progress update
+        pending: list[tuple] = []
+        for i, fut in enumerate(asyncio.as_completed(tasks)):
+            pos, entry, path = await fut
+            if path:
+                track_url = entry.get("webpage_url") or entry.get("url")
+                pending.append((
+                    playlist_id, pos, entry.get("title", "Unknown"), track_url,
+                    int(entry.get("duration") or 0), path,
+                ))
+                cached_count += 1
+            else:
                 failed_count += 1
 
-            # Update progress every 5 tracks
+            # Flush and update progress every 5 tracks
             if (i + 1) % 5 == 0:
+                await asyncio.to_thread(db.add_cached_playlist_tracks_bulk, pending)
+                pending = []
                 try:
                     await progress_msg.edit(
                         content=(
@@ -144,6 +182,9 @@ class CacheCog(commands.Cog):
                 except discord.HTTPException:
                     pass
 
+        if pending:
+            await asyncio.to_thread(db.add_cached_playlist_tracks_bulk, pending)
+
         # Final status
         total = len(already_cached) + cached_count
         result_lines = [f"Cached **{name}**: **{total}** total track(s)."]
@@ -168,8 +209,13 @@ class CacheCog(commands.Cog):
         name="playlocal",
         description="Play a cached playlist directly from local files (no encoding delay)",
     )
-    @app_commands.describe(name="Name of the cached playlist")
-    async def play_local(self, interaction: discord.Interaction, name: str):
+    @app_commands.describe(
+        name="Name of the cached playlist",
+        shuffle="Play the tracks in random order",
+    )
+    async def play_local(
+        self, interaction: discord.Interaction, name: str, shuffle: bool = False
+    ):
         if not interaction.user.voice or not interaction.user.voice.channel:
             await interaction.response.send_message(
                 "You need to be in a voice channel first.", ephemeral=True
@@ -187,7 +233,7 @@ class CacheCog(commands.Cog):
             )
             return
 
-        tracks = db.get_cached_playlist_tracks(playlist["id"])
+        tracks = db.get_cached_playlist_tracks(playlist["id"], shuffle=shuffle)
         if not tracks:
             await interaction.followup.send(
                 f"Cached playlist **{name}** has no tracks.", ephemeral=True
@@ -195,7 +241,8 @@ class CacheCog(commands.Cog):
             return
 
         # Filter to tracks whose files still exist on disk
-        valid_tracks = [t for t in tracks if os.path.isfile(t["file_path"])]
+        on_disk = cache_manager.existing_files(t.file_path for t in tracks)
+        valid_tracks = [t for t in tracks if t.file_path in on_disk]
         if not valid_tracks:
             await interaction.followup.send(
                 f"All cached files for **{name}** are missing. Re-run `/cache` to re-download.",
@@ -214,23 +261,27 @@ class CacheCog(commands.Cog):
         gq.voice_client = vc
         gq.text_channel = interaction.channel
 
-        was_playing = vc.is_playing() or vc.is_paused()
+        was_playing = is_active(vc)
 
         # Enqueue all tracks — the url field stores the local file path
-        # so from_query() will pick it up from the audio_cache or we
+        # so resolve() will pick it up from the audio_cache or we
         # override playback directly
-        for t in valid_tracks:
-            gq.add(SongEntry(
-                title=t["title"],
-                url=t["file_path"],  # local path — triggers local playback
-                duration=t["duration"] or 0,
+        gq.extend([
+            SongEntry(
+                title=t.title,
+                url=t.file_path,  # local path — triggers local playback
+                duration=t.duration or 0,
                 requester=interaction.user,
-            ))
-
-        if not was_playing:
-            from cogs.music import Music
-            music_cog: Music = interaction.client.cogs.get("Music")
-            if music_cog:
+            )
+            for t in valid_tracks
+        ])
+
+        from cogs.music import Music
+        music_cog: Music = interaction.client.cogs.get("Music")
+        if music_cog:
+            if was_playing:
+                music_cog._prefetch_next(gq)
+            else:
                 await music_cog._play_next(interaction.guild_id)
 
         skipped = len(tracks) - len(valid_tracks)
@@ -1,23 +1,35 @@
 import asyncio
+import logging
+import re
+
 import discord
 from discord import app_commands
 from discord.ext import commands
 
-from queue_manager import queue_manager, SongEntry
+from queue_manager import queue_manager, GuildQueue, SongEntry, is_active
 from ytdl_source import YTDLSource
 
+logger = logging.getLogger(__name__)
+
+# Playlist links: SoundCloud sets, YouTube list= params and /playlist pages.
+# Anchored on a URL so free-text searches mentioning "playlist" don't match.
+PLAYLIST_RE = re.compile(r"^https?://\S*(?:/sets/|[?&]list=|/playlist)", re.IGNORECASE)
 
-def _fmt_duration(seconds: int) -> str:
-    minutes, secs = divmod(seconds, 60)
-    hours, minutes = divmod(minutes, 60)
-    if hours:
-        return f"{hours}:{minutes:02d}:{secs:02d}"
-    return f"{minutes}:{secs:02d}"
+# Playlist tracks are appended to the queue in batches of this size as the
+# listing streams in
+_PLAYLIST_BATCH = 50
+# Upcoming entries whose missing title/duration are looked up in advance
+_WARM_AHEAD = 8
+
+# Canonical YouTube video URLs can be enqueued without a metadata lookup
+WATCH_RE = re.compile(
+    r"^https?://(?:www\.)?(?:youtube\.com/watch\?v=|youtu\.be/)([A-Za-z0-9_-]{11})"
+)
 
 
 def _build_now_playing_embed(
     song: SongEntry,
-    guild_id: int,
+    gq: GuildQueue,
     *,
     paused: bool = False,
 ) -> discord.Embed:
@@ -28,17 +40,15 @@ def _build_now_playing_embed(
         description=f"**{song.title}**",
         color=discord.Color.from_rgb(30, 215, 96),  # Spotify-ish green
     )
-    embed.add_field(name="Duration", value=f"`{_fmt_duration(song.duration)}`", inline=True)
+    embed.add_field(name="Duration", value=f"`{song.duration_str}`", inline=True)
     embed.add_field(name="Requested by", value=song.requester.mention, inline=True)
 
     # Next song preview
-    gq = queue_manager.get(guild_id)
-    entries = gq.list_entries()
-    if entries:
-        nxt = entries[0]
+    nxt = gq.peek_next()
+    if nxt:
         embed.add_field(
             name="Up Next",
-            value=f"{nxt.title}  `{_fmt_duration(nxt.duration)}`",
+            value=f"{nxt.title}  `{nxt.duration_str}`",
             inline=False,
         )
     else:
@@ -47,10 +57,16 @@ def _build_now_playing_embed(
     if song.thumbnail:
         embed.set_thumbnail(url=song.thumbnail)
 
-    embed.set_footer(text=f"{len(entries)} song(s) in queue")
+    embed.set_footer(text=f"{len(gq)} song(s) in queue")
     return embed
 
 
+def _log_after_callback_error(fut) -> None:
+    """Done-callback for the _play_next future scheduled from after=."""
+    if not fut.cancelled() and fut.exception():
+        logger.error("after= callback failed: %s", fut.exception())
+
+
 class NowPlayingView(discord.ui.View):
     """Persistent buttons attached to the now-playing panel."""
 
@@ -59,6 +75,15 @@ class NowPlayingView(discord.ui.View):
         self.cog = cog
         self.guild_id = guild_id
 
+    def set_paused(self, paused: bool) -> None:
+        """Show Resume while paused and Pause otherwise."""
+        if paused:
+            self.pause_resume.label = "Resume"
+            self.pause_resume.emoji = "\u25B6\uFE0F"
+        else:
+            self.pause_resume.label = "Pause"
+            self.pause_resume.emoji = "\u23F8\uFE0F"
+
     @discord.ui.button(label="Pause", style=discord.ButtonStyle.secondary, emoji="\u23F8\uFE0F")
     async def pause_resume(self, interaction: discord.Interaction, button: discord.ui.Button):
         vc = interaction.guild.voice_client
@@ -69,15 +94,13 @@ class NowPlayingView(discord.ui.View):
         gq = queue_manager.get(self.guild_id)
         if vc.is_playing():
             vc.pause()
-            button.label = "Resume"
-            button.emoji = "\u25B6\uFE0F"
-            embed = _build_now_playing_embed(gq.current, self.guild_id, paused=True)
+            self.set_paused(True)
+            embed = _build_now_playing_embed(gq.current, gq, paused=True)
             await interaction.response.edit_message(embed=embed, view=self)
         elif vc.is_paused():
             vc.resume()
-            button.label = "Pause"
-            button.emoji = "\u23F8\uFE0F"
-            embed = _build_now_playing_embed(gq.current, self.guild_id, paused=False)
+            self.set_paused(False)
+            embed = _build_now_playing_embed(gq.current, gq, paused=False)
             await interaction.response.edit_message(embed=embed, view=self)
         else:
             await interaction.response.send_message("Nothing is playing.", ephemeral=True)
@@ -86,7 +109,7 @@ class NowPlayingView(discord.ui.View):
     async def skip_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         gq = queue_manager.get(self.guild_id)
         vc = interaction.guild.voice_client
-        if not vc or not (vc.is_playing() or vc.is_paused()):
+        if not is_active(vc):
             await interaction.response.send_message("Nothing is playing.", ephemeral=True)
             return
         title = gq.current.title if gq.current else "Unknown"
@@ -97,6 +120,8 @@ class NowPlayingView(discord.ui.View):
 class Music(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # Strong refs to fire-and-forget tasks so they aren't GC'd mid-flight
+        self._background_tasks: set[asyncio.Task] = set()
 
     # ------------------------------------------------------------------
     # Helpers
@@ -115,8 +140,11 @@ class Music(commands.Cog):
         self,
         interaction: discord.Interaction,
         channel: discord.VoiceChannel,
-    ) -> discord.VoiceClient:
-        """Join the channel if needed, or reuse/move an existing voice client."""
+    ) -> tuple[GuildQueue, discord.VoiceClient]:
+        """
+        Join the channel if needed, or reuse/move an existing voice client.
+        Returns the guild's queue alongside it so callers don't look it up again.
+        """
         gq = queue_manager.get(interaction.guild_id)
         vc = interaction.guild.voice_client
         if vc is None:
@@ -125,7 +153,7 @@ class Music(commands.Cog):
             await vc.move_to(channel)
         gq.voice_client = vc
         gq.text_channel = interaction.channel
-        return vc
+        return gq, vc
 
     async def _play_next(self, guild_id: int) -> None:
         """
@@ -134,46 +162,149 @@ class Music(commands.Cog):
         run_coroutine_threadsafe) and directly when nothing is playing.
         """
         gq = queue_manager.get(guild_id)
-        async with gq._lock:
-            entry = gq.pop_next()
-            if entry is None:
-                gq.current = None
+        # One _play_next per guild at a time: a command and the after=
+        # callback racing here would both pop a song, and the second
+        # vc.play() would cut off the first.
+        async with gq._play_lock:
+            if is_active(gq.voice_client):
                 return
-            gq.current = entry
+            started = await self._start_next(gq, guild_id)
+        # Outside the lock; the panel is a REST round trip
+        if started:
+            await self._send_now_playing(guild_id)
+
+    async def _start_next(self, gq: GuildQueue, guild_id: int) -> bool:
+        """Body of _play_next; caller holds gq._play_lock. True if a song started."""
+        source = None
+        while source is None:
+            async with gq._lock:
+                entry = gq.pop_next()
+                if entry is None:
+                    gq.current = None
+                    return False
+                gq.current = entry
+
+            # Voice client may have disconnected
+            if not gq.voice_client or not gq.voice_client.is_connected():
+                gq.current = None
+                return False
 
-        # Voice client may have disconnected
-        if not gq.voice_client or not gq.voice_client.is_connected():
-            gq.current = None
-            return
+            # Use the resolution prefetched while the previous song played, if any
+            resolved = None
+            prefetch = gq.take_prefetched(entry)
+            if prefetch is not None:
+                try:
+                    resolved = await prefetch
+                except Exception as exc:
+                    logger.warning("Prefetch of %r failed, retrying: %s", entry.title, exc)
 
-        try:
-            source = await YTDLSource.from_query(entry.url, loop=self.bot.loop)
-        except Exception as exc:
-            print(f"[audio error] Could not resolve '{entry.title}': {exc}")
-            # skip to next song
-            await self._play_next(guild_id)
-            return
+            if resolved is None:
+                try:
+                    resolved = await self._resolve(entry.url)
+                except Exception as exc:
+                    # skip to next song
+                    logger.warning("Could not resolve %r: %s", entry.title, exc)
+                    continue
+
+            # ffmpeg starts only now, so a stream connection never idles
+            # through the previous song
+            try:
+                source = YTDLSource.from_resolved(resolved)
+            except Exception as exc:
+                logger.warning("Could not start %r: %s", entry.title, exc)
+
+        entry.fill_missing(source.title, source.duration, source.thumbnail)
 
         def after_playing(error):
             if error:
-                print(f"[playback error] {error}")
+                logger.error("Playback error: %s", error)
+            # Don't block the voice thread while the next song resolves
             fut = asyncio.run_coroutine_threadsafe(
                 self._play_next(guild_id), self.bot.loop
             )
-            try:
-                fut.result()
-            except Exception as exc:
-                print(f"[after callback error] {exc}")
+            fut.add_done_callback(_log_after_callback_error)
 
         gq.voice_client.play(source, after=after_playing)
-        await self._send_now_playing(guild_id)
+        self._prefetch_next(gq)
+        return True
+
+    def _spawn(self, coro) -> None:
+        """Run a coroutine in the background without awaiting it."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    @staticmethod
+    async def _safe_delete(message: discord.Message) -> None:
+        try:
+            await message.delete()
+        except discord.HTTPException:
+            pass
+
+    async def _resolve(self, url: str) -> dict:
+        """Resolve what to play for a URL; see YTDLSource.resolve."""
+        return await YTDLSource.resolve(url)
+
+    def _prefetch_next(self, gq: GuildQueue) -> None:
+        """
+        Start resolving the upcoming song so it's ready when this one ends.
+        Only the lookup/download runs ahead; ffmpeg starts at play time.
+        Called when playback starts and whenever the head of the queue changes
+        while something is playing (enqueue into an empty queue, playnext,
+        shuffle); a prefetch for a song that's no longer next is discarded.
+        """
+        nxt = gq.peek_next()
+        if gq.prefetched is not None and gq.prefetched[0] is nxt:
+            return
+        gq.discard_prefetch()
+        if nxt is None:
+            return
+        task = asyncio.create_task(self._resolve(nxt.url))
+        gq.prefetched = (nxt, task)
+
+    async def _warm_upcoming(self, gq: GuildQueue) -> None:
+        """
+        Fill in title/duration for the next few entries that were enqueued
+        without them (flat playlist listings), so /queue shows real names.
+        """
+        entries = [
+            e for e in gq.iter_entries(_WARM_AHEAD)
+            if e.title == e.url or not e.duration
+        ]
+        if not entries:
+            return
+        metas = await YTDLSource.resolve_many([e.url for e in entries])
+        for entry, meta in zip(entries, metas):
+            if meta is not None:
+                entry.fill_missing(meta["title"], meta["duration"], meta["thumbnail"])
+
+    def _now_playing_view(self, gq: GuildQueue, guild_id: int) -> NowPlayingView:
+        """Return the guild's NowPlayingView, creating it on first use."""
+        if gq.now_playing_view is None:
+            gq.now_playing_view = NowPlayingView(self, guild_id)
+        return gq.now_playing_view
 
     async def _send_now_playing(self, guild_id: int) -> None:
-        """Send (or replace) the now-playing panel in the text channel."""
+        """Update the now-playing panel in place, or replace it if chat moved on."""
         gq = queue_manager.get(guild_id)
         if not gq.current or not gq.text_channel:
             return
 
+        embed = _build_now_playing_embed(gq.current, gq)
+        view = self._now_playing_view(gq, guild_id)
+        view.set_paused(False)
+
+        # Still the latest message in the channel — one edit instead of delete + send
+        msg = gq.now_playing_message
+        if msg and getattr(gq.text_channel, "last_message_id", None) == msg.id:
+            try:
+                gq.now_playing_message = await msg.edit(embed=embed, view=view)
+                return
+            except discord.NotFound:
+                gq.now_playing_message = None
+            except discord.HTTPException:
+                pass
+
         # Delete the previous panel so chat stays clean
         if gq.now_playing_message:
             try:
@@ -181,14 +312,73 @@ class Music(commands.Cog):
             except discord.HTTPException:
                 pass
 
-        embed = _build_now_playing_embed(gq.current, guild_id)
-        view = NowPlayingView(self, guild_id)
         gq.now_playing_message = await gq.text_channel.send(embed=embed, view=view)
 
     # ------------------------------------------------------------------
     # Commands
     # ------------------------------------------------------------------
 
+    async def _play_playlist(
+        self,
+        interaction: discord.Interaction,
+        channel: discord.VoiceChannel,
+        url: str,
+    ) -> None:
+        """
+        Enqueue a playlist as its listing streams in. Playback starts on the
+        first track; the rest are appended in batches as pages arrive.
+        """
+        gq = vc = None
+        was_playing = False
+        batch: list[SongEntry] = []
+        count = 0
+        error = None
+        try:
+            async for t in YTDLSource.iter_playlist_metadata(url):
+                batch.append(SongEntry(
+                    title=t["title"],
+                    url=t["url"],
+                    duration=t["duration"],
+                    requester=interaction.user,
+                    thumbnail=t.get("thumbnail"),
+                ))
+                if gq is None:
+                    # First track: join and get it playing right away
+                    gq, vc = await self._get_voice_client(interaction, channel)
+                    was_playing = is_active(vc)
+                elif len(batch) < _PLAYLIST_BATCH:
+                    continue
+                gq.extend(batch)
+                count += len(batch)
+                batch = []
+                if count == 1 and not was_playing:
+                    self._spawn(self._play_next(interaction.guild_id))
+        except ValueError as exc:
+            error = exc
+
+        if batch:
+            gq.extend(batch)
+            count += len(batch)
+
+        if not count:
+            await interaction.followup.send(
+                str(error) if error else "No playable tracks found in that playlist."
+            )
+            return
+
+        if gq.current:
+            self._prefetch_next(gq)
+        self._spawn(self._warm_upcoming(gq))
+
+        desc = (
+            f"{'Added' if was_playing else 'Started playing'} "
+            f"**{count}** track(s) from playlist."
+        )
+        if error:
+            desc += f"\nListing stopped early: {error}"
+        embed = discord.Embed(description=desc, color=discord.Color.green())
+        await interaction.followup.send(embed=embed)
+
     @app_commands.command(name="play", description="Play a song or add it to the queue")
     @app_commands.describe(query="Song name, URL, or playlist URL")
     async def play(self, interaction: discord.Interaction, query: str):
@@ -199,55 +389,26 @@ class Music(commands.Cog):
             return
 
         # Detect playlist URLs (SoundCloud /sets/, YouTube /playlist, etc.)
-        is_playlist = "/sets/" in query or "playlist" in query
+        is_playlist = bool(PLAYLIST_RE.match(query))
 
         if is_playlist:
+            await self._play_playlist(interaction, channel, query)
+            return
+
+        if m := WATCH_RE.match(query):
+            # Canonical URL so the audio cache (keyed by webpage_url) hits for
+            # youtu.be and ?si=/&t= variants too. Title/duration are filled
+            # in by _play_next once the song resolves.
+            url = f"https://www.youtube.com/watch?v={m[1]}"
+            meta = {"title": url, "url": url, "duration": 0}
+        else:
             try:
-                tracks = await YTDLSource.fetch_playlist_metadata(
-                    query, loop=self.bot.loop
-                )
+                meta = await YTDLSource.fetch_metadata_only(query)
             except ValueError as exc:
                 await interaction.followup.send(str(exc))
                 return
 
-            if not tracks:
-                await interaction.followup.send("No playable tracks found in that playlist.")
-                return
-
-            vc = await self._get_voice_client(interaction, channel)
-            gq = queue_manager.get(interaction.guild_id)
-            was_playing = vc.is_playing() or vc.is_paused()
-
-            for t in tracks:
-                gq.add(SongEntry(
-                    title=t["title"],
-                    url=t["url"],
-                    duration=t["duration"],
-                    requester=interaction.user,
-                    thumbnail=t.get("thumbnail"),
-                ))
-
-            if not was_playing:
-                await self._play_next(interaction.guild_id)
-
-            embed = discord.Embed(
-                description=(
-                    f"{'Added' if was_playing else 'Started playing'} "
-                    f"**{len(tracks)}** track(s) from playlist."
-                ),
-                color=discord.Color.green(),
-            )
-            await interaction.followup.send(embed=embed)
-            return
-
-        try:
-            meta = await YTDLSource.fetch_metadata_only(query, loop=self.bot.loop)
-        except ValueError as exc:
-            await interaction.followup.send(str(exc))
-            return
-
-        vc = await self._get_voice_client(interaction, channel)
-        gq = queue_manager.get(interaction.guild_id)
+        gq, vc = await self._get_voice_client(interaction, channel)
 
         entry = SongEntry(
             title=meta["title"],
@@ -259,18 +420,28 @@ class Music(commands.Cog):
 
         gq.add(entry)
 
-        if vc.is_playing() or vc.is_paused():
+        if is_active(vc):
+            self._prefetch_next(gq)
             embed = discord.Embed(
                 description=f"Added to queue (#{len(gq)}): **{entry.title}**",
                 color=discord.Color.blurple(),
             )
-            embed.add_field(name="Duration", value=_fmt_duration(entry.duration))
+            embed.add_field(name="Duration", value=entry.duration_str)
             await interaction.followup.send(embed=embed)
         else:
             await self._play_next(interaction.guild_id)
-            await interaction.followup.send(
-                f"Started playing **{entry.title}**", silent=True
-            )
+            if gq.current is entry:
+                await interaction.followup.send(
+                    f"Started playing **{entry.title}**", silent=True
+                )
+            elif any(e is entry for e in gq.iter_entries()):
+                # Something else started first; this one waits its turn
+                await interaction.followup.send(
+                    f"Added to queue (#{len(gq)}): **{entry.title}**"
+                )
+            else:
+                # Fast-pathed URLs are only checked at play time
+                await interaction.followup.send(f"Could not play **{entry.title}**.")
 
     @app_commands.command(
         name="playnext",
@@ -285,13 +456,12 @@ class Music(commands.Cog):
             return
 
         try:
-            meta = await YTDLSource.fetch_metadata_only(query, loop=self.bot.loop)
+            meta = await YTDLSource.fetch_metadata_only(query)
         except ValueError as exc:
             await interaction.followup.send(str(exc))
             return
 
-        vc = await self._get_voice_client(interaction, channel)
-        gq = queue_manager.get(interaction.guild_id)
+        gq, vc = await self._get_voice_client(interaction, channel)
 
         entry = SongEntry(
             title=meta["title"],
@@ -301,13 +471,14 @@ class Music(commands.Cog):
             thumbnail=meta.get("thumbnail"),
         )
 
-        if vc.is_playing() or vc.is_paused():
+        if is_active(vc):
             gq.add_next(entry)
+            self._prefetch_next(gq)
             embed = discord.Embed(
                 description=f"Playing next: **{entry.title}**",
                 color=discord.Color.blurple(),
             )
-            embed.add_field(name="Duration", value=_fmt_duration(entry.duration))
+            embed.add_field(name="Duration", value=entry.duration_str)
             await interaction.followup.send(embed=embed)
         else:
             # Nothing playing — just start it
@@ -321,7 +492,7 @@ class Music(commands.Cog):
     async def skip(self, interaction: discord.Interaction):
         gq = queue_manager.get(interaction.guild_id)
         vc = interaction.guild.voice_client
-        if not vc or not (vc.is_playing() or vc.is_paused()):
+        if not is_active(vc):
             await interaction.response.send_message(
                 "Nothing is playing right now.", ephemeral=True
             )
@@ -333,13 +504,13 @@ class Music(commands.Cog):
     @app_commands.command(name="stop", description="Stop playback and clear the queue")
     async def stop(self, interaction: discord.Interaction):
         gq = queue_manager.get(interaction.guild_id)
-        # Clean up the now-playing panel
+        # Clean up the now-playing panel without holding up the disconnect
         if gq.now_playing_message:
-            try:
-                await gq.now_playing_message.delete()
-            except discord.HTTPException:
-                pass
+            self._spawn(self._safe_delete(gq.now_playing_message))
             gq.now_playing_message = None
+        if gq.now_playing_view is not None:
+            gq.now_playing_view.stop()
+            gq.now_playing_view = None
         gq.clear()
         vc = interaction.guild.voice_client
         if vc:
@@ -350,14 +521,16 @@ class Music(commands.Cog):
 
     @app_commands.command(name="pause", description="Pause playback")
     async def pause(self, interaction: discord.Interaction):
+        gq = queue_manager.get(interaction.guild_id)
         vc = interaction.guild.voice_client
         if vc and vc.is_playing():
             vc.pause()
-            gq = queue_manager.get(interaction.guild_id)
             if gq.now_playing_message and gq.current:
-                embed = _build_now_playing_embed(gq.current, interaction.guild_id, paused=True)
+                embed = _build_now_playing_embed(gq.current, gq, paused=True)
+                view = self._now_playing_view(gq, interaction.guild_id)
+                view.set_paused(True)
                 try:
-                    await gq.now_playing_message.edit(embed=embed)
+                    await gq.now_playing_message.edit(embed=embed, view=view)
                 except discord.HTTPException:
                     pass
             await interaction.response.send_message("Paused.", ephemeral=True)
@@ -368,14 +541,16 @@ class Music(commands.Cog):
 
     @app_commands.command(name="resume", description="Resume playback")
     async def resume(self, interaction: discord.Interaction):
+        gq = queue_manager.get(interaction.guild_id)
         vc = interaction.guild.voice_client
         if vc and vc.is_paused():
             vc.resume()
-            gq = queue_manager.get(interaction.guild_id)
             if gq.now_playing_message and gq.current:
-                embed = _build_now_playing_embed(gq.current, interaction.guild_id, paused=False)
+                embed = _build_now_playing_embed(gq.current, gq, paused=False)
+                view = self._now_playing_view(gq, interaction.guild_id)
+                view.set_paused(False)
                 try:
-                    await gq.now_playing_message.edit(embed=embed)
+                    await gq.now_playing_message.edit(embed=embed, view=view)
                 except discord.HTTPException:
                     pass
             await interaction.response.send_message("Resumed.", ephemeral=True)
@@ -394,34 +569,32 @@ class Music(commands.Cog):
             return
         vc = interaction.guild.voice_client
         paused = vc.is_paused() if vc else False
-        embed = _build_now_playing_embed(gq.current, interaction.guild_id, paused=paused)
-        view = NowPlayingView(self, interaction.guild_id)
+        embed = _build_now_playing_embed(gq.current, gq, paused=paused)
+        view = self._now_playing_view(gq, interaction.guild_id)
+        view.set_paused(paused)
         gq.text_channel = interaction.channel
         await interaction.response.send_message(embed=embed, view=view)
 
     @app_commands.command(name="queue", description="Show the current queue")
     async def queue_cmd(self, interaction: discord.Interaction):
         gq = queue_manager.get(interaction.guild_id)
-        entries = gq.list_entries()
+        total = len(gq)
 
-        if not entries and not gq.current:
+        if not total and not gq.current:
             await interaction.response.send_message(
                 "The queue is empty.", ephemeral=True
             )
             return
 
-        lines = []
-        for i, e in enumerate(entries[:20]):
-            lines.append(
-                f"`{i + 1}.` **{e.title}** [{_fmt_duration(e.duration)}]"
-                f" — {e.requester.display_name}"
-            )
-        if len(entries) > 20:
-            lines.append(f"*... and {len(entries) - 20} more*")
+        body = "\n".join(
+            f"`{i}.` {e.queue_line()}" for i, e in enumerate(gq.iter_entries(20), 1)
+        )
+        if total > 20:
+            body += f"\n*... and {total - 20} more*"
 
         embed = discord.Embed(
-            title=f"Queue — {len(entries)} song(s) up next",
-            description="\n".join(lines) if lines else "*Queue is empty*",
+            title=f"Queue — {total} song(s) up next",
+            description=body or "*Queue is empty*",
             color=discord.Color.blue(),
         )
         if gq.current:
@@ -438,6 +611,8 @@ class Music(commands.Cog):
             )
             return
         gq.shuffle()
+        if gq.current:
+            self._prefetch_next(gq)
         await interaction.response.send_message(
             f"Shuffled {len(gq)} songs in the queue."
         )
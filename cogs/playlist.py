@@ -1,21 +1,16 @@
+import asyncio
 import sqlite3
+
 import discord
 from discord import app_commands
 from discord.ext import commands
 
 import database as db
-from queue_manager import queue_manager, SongEntry
+from queue_manager import queue_manager, SongEntry, is_active
+from utils import fmt_duration
 from ytdl_source import YTDLSource
 
 
-def _fmt_duration(seconds: int) -> str:
-    minutes, secs = divmod(seconds, 60)
-    hours, minutes = divmod(minutes, 60)
-    if hours:
-        return f"{hours}:{minutes:02d}:{secs:02d}"
-    return f"{minutes}:{secs:02d}"
-
-
 class PlaylistCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
@@ -59,7 +54,7 @@ class PlaylistCog(commands.Cog):
             return
 
         try:
-            meta = await YTDLSource.fetch_metadata_only(song, loop=self.bot.loop)
+            meta = await YTDLSource.fetch_metadata_only(song)
         except ValueError as exc:
             await interaction.followup.send(str(exc))
             return
@@ -71,6 +66,49 @@ class PlaylistCog(commands.Cog):
             f"Added **{meta['title']}** to playlist **{name}**."
         )
 
+    # ------------------------------------------------------------------
+    # /playlist import
+    # ------------------------------------------------------------------
+
+    @playlist_group.command(
+        name="import", description="Add every track from a playlist URL to a playlist"
+    )
+    @app_commands.describe(name="Playlist name", url="Playlist URL to import from")
+    async def import_cmd(self, interaction: discord.Interaction, name: str, url: str):
+        await interaction.response.defer(thinking=True)
+
+        row = db.get_playlist(str(interaction.guild_id), name)
+        if row is None:
+            await interaction.followup.send(
+                f"Playlist **{name}** not found.", ephemeral=True
+            )
+            return
+
+        try:
+            tracks = await YTDLSource.fetch_playlist_metadata(url)
+        except ValueError as exc:
+            await interaction.followup.send(str(exc))
+            return
+
+        if not tracks:
+            await interaction.followup.send("No playable tracks found in that playlist.")
+            return
+
+        # The flat listing leaves some titles/durations blank, and saved
+        # playlists are never revisited, so look those up before storing
+        missing = [t for t in tracks if t["title"] == t["url"] or not t["duration"]]
+        if missing:
+            metas = await YTDLSource.resolve_many([t["url"] for t in missing])
+            for track, meta in zip(missing, metas):
+                if meta is not None:
+                    track["title"] = meta["title"]
+                    track["duration"] = track["duration"] or meta["duration"]
+
+        await asyncio.to_thread(db.add_songs_to_playlist, row["id"], tracks)
+        await interaction.followup.send(
+            f"Imported **{len(tracks)}** song(s) into playlist **{name}**."
+        )
+
     # ------------------------------------------------------------------
     # /playlist remove
     # ------------------------------------------------------------------
@@ -82,7 +120,12 @@ class PlaylistCog(commands.Cog):
         name="Playlist name",
         index="Song number (as shown in /playlist view)",
     )
-    async def remove(self, interaction: discord.Interaction, name: str, index: int):
+    async def remove(
+        self,
+        interaction: discord.Interaction,
+        name: str,
+        index: app_commands.Range[int, 1, None],
+    ):
         row = db.get_playlist(str(interaction.guild_id), name)
         if row is None:
             await interaction.response.send_message(
@@ -113,7 +156,7 @@ class PlaylistCog(commands.Cog):
             )
             return
 
-        lines = [f"`{r['name']}` — {r['song_count']} song(s)" for r in rows]
+        lines = [f"`{r.name}` — {r.song_count} song(s)" for r in rows]
         embed = discord.Embed(
             title="Server Playlists",
             description="\n".join(lines),
@@ -136,8 +179,8 @@ class PlaylistCog(commands.Cog):
             )
             return
 
-        songs = db.get_playlist_songs(row["id"])
-        if not songs:
+        total = db.count_playlist_songs(row["id"])
+        if not total:
             await interaction.response.send_message(
                 f"Playlist **{name}** is empty. Add songs with `/playlist add`.",
                 ephemeral=True,
@@ -145,18 +188,18 @@ class PlaylistCog(commands.Cog):
             return
 
         lines = []
-        for s in songs[:25]:
-            dur = _fmt_duration(s["duration"]) if s["duration"] else "?"
-            lines.append(f"`{s['position'] + 1}.` **{s['title']}** [{dur}]")
-        if len(songs) > 25:
-            lines.append(f"*... and {len(songs) - 25} more*")
+        for s in db.get_playlist_songs(row["id"], limit=25):
+            dur = fmt_duration(s.duration) if s.duration else "?"
+            lines.append(f"`{s.idx + 1}.` **{s.title}** [{dur}]")
+        if total > 25:
+            lines.append(f"*... and {total - 25} more*")
 
         embed = discord.Embed(
             title=f"Playlist: {name}",
             description="\n".join(lines),
             color=discord.Color.orange(),
         )
-        embed.set_footer(text=f"{len(songs)} song(s)")
+        embed.set_footer(text=f"{total} song(s)")
         await interaction.response.send_message(embed=embed)
 
     # ------------------------------------------------------------------
@@ -199,25 +242,26 @@ class PlaylistCog(commands.Cog):
             await vc.move_to(channel)
         gq.voice_client = vc
 
-        # Enqueue all songs
-        for s in songs:
-            gq.add(
-                SongEntry(
-                    title=s["title"],
-                    url=s["url"],
-                    duration=s["duration"] or 0,
-                    requester=interaction.user,
-                )
-            )
-
-        was_playing = vc.is_playing() or vc.is_paused()
-
-        # Start playback if idle
-        if not was_playing:
-            # Import here to avoid circular import at module level
-            from cogs.music import Music
-            music_cog: Music = interaction.client.cogs.get("Music")
-            if music_cog:
+        entries = [
+            SongEntry(
+                title=s.title,
+                url=s.url,
+                duration=s.duration or 0,
+                requester=interaction.user,
+            )
+            for s in songs
+        ]
+
+        was_playing = is_active(vc)
+        gq.extend(entries)
+
+        # Import here to avoid circular import at module level
+        from cogs.music import Music
+        music_cog: Music = interaction.client.cogs.get("Music")
+        if music_cog:
+            if was_playing:
+                music_cog._prefetch_next(gq)
+            else:
                 await music_cog._play_next(interaction.guild_id)
 
         embed = discord.Embed(
@@ -5,3 +5,5 @@ load_dotenv()
 
 DISCORD_TOKEN: str = os.environ["DISCORD_TOKEN"]
 GUILD_ID: int | None = int(os.environ["GUILD_ID"]) if os.environ.get("GUILD_ID") else None
+# Max tracks downloaded/encoded at once by /cache
+CACHE_CONCURRENCY: int = int(os.environ.get("CACHE_CONCURRENCY", "8"))
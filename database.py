@@ -1,28 +1,83 @@
 import sqlite3
 import threading
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 DB_PATH = Path(__file__).parent / "music.db"
 
+# Reads use per-thread read-only connections; all writes go through one
+# connection behind a lock, so WAL never sees competing writers.
 _local = threading.local()
+_writer_conn: Optional[sqlite3.Connection] = None
+_WRITER_LOCK = threading.RLock()
+
+# Row types for the bulk read paths. Column lists in the matching queries
+# must stay in this order.
+PlaylistSummary = namedtuple("PlaylistSummary", "id name song_count")
+# idx is the 0-based display index; stored positions may have gaps
+PlaylistSong = namedtuple("PlaylistSong", "id playlist_id idx title url duration")
+CachedPlaylistTrack = namedtuple(
+    "CachedPlaylistTrack", "id playlist_id position title url duration file_path"
+)
+
+
+def _connect(target: str, **kwargs) -> sqlite3.Connection:
+    # Every query in this module fits in the prepared-statement cache,
+    # so repeat calls skip SQLite's parse/plan step
+    conn = sqlite3.connect(
+        target, check_same_thread=False, cached_statements=256, **kwargs
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA mmap_size = 268435456")  # 256 MiB
+    conn.execute("PRAGMA cache_size = -65536")  # 64 MiB page cache
+    conn.execute("PRAGMA busy_timeout = 3000")
+    return conn
+
+
+def _get_writer_conn() -> sqlite3.Connection:
+    """Return the process-wide write connection. Caller must hold _WRITER_LOCK."""
+    global _writer_conn
+    if _writer_conn is None:
+        conn = _connect(str(DB_PATH))
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA journal_mode = WAL")
+        # Safe under WAL: commits no longer fsync, only checkpoints do
+        conn.execute("PRAGMA synchronous = NORMAL")
+        _writer_conn = conn
+    return _writer_conn
 
 
 def _get_conn() -> sqlite3.Connection:
-    """Return a thread-local SQLite connection."""
+    """Return this thread's read-only SQLite connection."""
     if not hasattr(_local, "conn"):
-        conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")
-        conn.execute("PRAGMA journal_mode = WAL")
-        _local.conn = conn
+        _local.conn = _connect(f"{DB_PATH.as_uri()}?mode=ro", uri=True)
     return _local.conn
 
 
+@contextmanager
+def _write() -> Iterator[sqlite3.Connection]:
+    """Run the body as one transaction on the writer connection."""
+    with _WRITER_LOCK:
+        conn = _get_writer_conn()
+        with conn:
+            yield conn
+
+
+def _fetch_as(row_type, sql: str, params: tuple = ()) -> list:
+    """Run a query and build each row straight into `row_type` (a namedtuple)."""
+    cur = _get_conn().cursor()
+    cur.row_factory = lambda _cur, row: row_type._make(row)
+    return cur.execute(sql, params).fetchall()
+
+
 def init_db() -> None:
     """Create tables on first run."""
-    conn = _get_conn()
-    conn.executescript("""
+    with _WRITER_LOCK:
+        conn = _get_writer_conn()
+        conn.executescript("""
         CREATE TABLE IF NOT EXISTS playlists (
             id         INTEGER PRIMARY KEY AUTOINCREMENT,
             guild_id   TEXT    NOT NULL,
@@ -56,6 +111,7 @@ def init_db() -> None:
         );
 
         CREATE INDEX IF NOT EXISTS idx_cache_url ON audio_cache(url);
+        CREATE INDEX IF NOT EXISTS idx_cache_last_played ON audio_cache(last_played);
 
         CREATE TABLE IF NOT EXISTS cached_playlists (
             id          INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -78,8 +134,10 @@ def init_db() -> None:
         );
 
         CREATE INDEX IF NOT EXISTS idx_cached_pl_guild ON cached_playlists(guild_id);
+        CREATE INDEX IF NOT EXISTS idx_cached_pl_tracks_pos
+            ON cached_playlist_tracks(playlist_id, position);
     """)
-    conn.commit()
+        conn.commit()
 
 
 # ---------------------------------------------------------------------------
@@ -88,42 +146,38 @@ def init_db() -> None:
 
 def create_playlist(guild_id: str, name: str) -> int:
     """Insert a new playlist. Raises sqlite3.IntegrityError if name already exists."""
-    conn = _get_conn()
-    cur = conn.execute(
-        "INSERT INTO playlists (guild_id, name) VALUES (?, ?)",
-        (guild_id, name),
-    )
-    conn.commit()
-    return cur.lastrowid
+    with _write() as conn:
+        playlist_id = conn.execute(
+            "INSERT INTO playlists (guild_id, name) VALUES (?, ?) RETURNING id",
+            (guild_id, name),
+        ).fetchone()[0]
+    return playlist_id
 
 
 def get_playlist(guild_id: str, name: str) -> Optional[sqlite3.Row]:
     conn = _get_conn()
     return conn.execute(
-        "SELECT * FROM playlists WHERE guild_id = ? AND name = ?",
+        "SELECT id, guild_id, name FROM playlists WHERE guild_id = ? AND name = ?",
         (guild_id, name),
     ).fetchone()
 
 
-def list_playlists(guild_id: str) -> list:
-    conn = _get_conn()
-    return conn.execute(
-        "SELECT p.id, p.name, COUNT(s.id) AS song_count "
-        "FROM playlists p "
-        "LEFT JOIN playlist_songs s ON s.playlist_id = p.id "
-        "WHERE p.guild_id = ? "
-        "GROUP BY p.id ORDER BY p.name",
+def list_playlists(guild_id: str) -> list[PlaylistSummary]:
+    return _fetch_as(
+        PlaylistSummary,
+        "SELECT p.id, p.name, "
+        "(SELECT COUNT(*) FROM playlist_songs s WHERE s.playlist_id = p.id) AS song_count "
+        "FROM playlists p WHERE p.guild_id = ? ORDER BY p.name",
         (guild_id,),
-    ).fetchall()
+    )
 
 
 def delete_playlist(guild_id: str, name: str) -> bool:
-    conn = _get_conn()
-    deleted = conn.execute(
-        "DELETE FROM playlists WHERE guild_id = ? AND name = ?",
-        (guild_id, name),
-    ).rowcount
-    conn.commit()
+    with _write() as conn:
+        deleted = conn.execute(
+            "DELETE FROM playlists WHERE guild_id = ? AND name = ?",
+            (guild_id, name),
+        ).rowcount
     return bool(deleted)
 
 
@@ -137,91 +191,158 @@ def add_song_to_playlist(
     url: str,
     duration: int,
 ) -> None:
-    conn = _get_conn()
-    row = conn.execute(
-        "SELECT COALESCE(MAX(position) + 1, 0) AS next_pos "
-        "FROM playlist_songs WHERE playlist_id = ?",
-        (playlist_id,),
-    ).fetchone()
-    conn.execute(
-        "INSERT INTO playlist_songs (playlist_id, position, title, url, duration) "
-        "VALUES (?, ?, ?, ?, ?)",
-        (playlist_id, row["next_pos"], title, url, duration),
-    )
-    conn.commit()
+    with _write() as conn:
+        # Next position is computed inside the INSERT: one statement, no read-back
+        conn.execute(
+            "INSERT INTO playlist_songs (playlist_id, position, title, url, duration) "
+            "SELECT ?, COALESCE(MAX(position) + 1, 0), ?, ?, ? "
+            "FROM playlist_songs WHERE playlist_id = ?",
+            (playlist_id, title, url, duration, playlist_id),
+        )
+
+
+def add_songs_to_playlist(playlist_id: int, songs: list[dict]) -> None:
+    """Append songs (dicts with title/url/duration) in a single transaction."""
+    with _write() as conn:
+        row = conn.execute(
+            "SELECT COALESCE(MAX(position) + 1, 0) AS next_pos "
+            "FROM playlist_songs WHERE playlist_id = ?",
+            (playlist_id,),
+        ).fetchone()
+        conn.executemany(
+            "INSERT INTO playlist_songs (playlist_id, position, title, url, duration) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (playlist_id, row["next_pos"] + i, s["title"], s["url"], s["duration"])
+                for i, s in enumerate(songs)
+            ],
+        )
 
 
 def remove_song_from_playlist(playlist_id: int, index: int) -> bool:
-    """Remove the song at 0-based index and compact positions. Returns True if deleted."""
-    conn = _get_conn()
-    with conn:
+    """
+    Remove the song at 0-based index. Returns True if deleted.
+    position is only a sort key, so later songs are not renumbered.
+    """
+    # SQLite treats a negative OFFSET as 0, which would hit the first song
+    if index < 0:
+        return False
+    with _write() as conn:
         deleted = conn.execute(
-            "DELETE FROM playlist_songs WHERE playlist_id = ? AND position = ?",
+            "DELETE FROM playlist_songs WHERE id = ("
+            "  SELECT id FROM playlist_songs WHERE playlist_id = ? "
+            "  ORDER BY position LIMIT 1 OFFSET ?"
+            ")",
             (playlist_id, index),
         ).rowcount
-        if deleted:
-            conn.execute(
-                "UPDATE playlist_songs SET position = position - 1 "
-                "WHERE playlist_id = ? AND position > ?",
-                (playlist_id, index),
-            )
     return bool(deleted)
 
 
-def get_playlist_songs(playlist_id: int) -> list:
+def get_playlist_songs(playlist_id: int, limit: Optional[int] = None) -> list[PlaylistSong]:
+    """Songs in playlist order; only the first `limit` rows if given."""
+    sql = (
+        "SELECT id, playlist_id, ROW_NUMBER() OVER (ORDER BY position) - 1, "
+        "title, url, duration "
+        "FROM playlist_songs WHERE playlist_id = ? ORDER BY position"
+    )
+    if limit is None:
+        return _fetch_as(PlaylistSong, sql, (playlist_id,))
+    return _fetch_as(PlaylistSong, sql + " LIMIT ?", (playlist_id, limit))
+
+
+def count_playlist_songs(playlist_id: int) -> int:
     conn = _get_conn()
-    return conn.execute(
-        "SELECT * FROM playlist_songs WHERE playlist_id = ? ORDER BY position",
+    row = conn.execute(
+        "SELECT COUNT(*) AS n FROM playlist_songs WHERE playlist_id = ?",
         (playlist_id,),
-    ).fetchall()
+    ).fetchone()
+    return row["n"]
 
 
 # ---------------------------------------------------------------------------
 # Audio cache CRUD
 # ---------------------------------------------------------------------------
 
+# In-process LRU of audio_cache lookups (misses included), keyed by URL.
+# Every write to audio_cache goes through this module and invalidates it.
+_TRACK_CACHE_MAX = 1024
+_track_cache: OrderedDict[str, Optional[sqlite3.Row]] = OrderedDict()
+_track_cache_lock = threading.Lock()
+# Bumped by every invalidation; a lookup only stores its row if no write
+# landed while it was reading, so a stale row or miss is never cached
+_track_cache_gen = 0
+
+
+def _invalidate_tracks(urls) -> None:
+    global _track_cache_gen
+    with _track_cache_lock:
+        _track_cache_gen += 1
+        for url in urls:
+            _track_cache.pop(url, None)
+
+
 def get_cached_track(url: str) -> Optional[sqlite3.Row]:
+    with _track_cache_lock:
+        if url in _track_cache:
+            _track_cache.move_to_end(url)
+            return _track_cache[url]
+        gen = _track_cache_gen
     conn = _get_conn()
-    return conn.execute(
-        "SELECT * FROM audio_cache WHERE url = ?", (url,)
+    row = conn.execute(
+        "SELECT url, file_path, title, duration, file_size FROM audio_cache WHERE url = ?",
+        (url,),
     ).fetchone()
+    with _track_cache_lock:
+        if gen != _track_cache_gen:
+            return row
+        _track_cache[url] = row
+        if len(_track_cache) > _TRACK_CACHE_MAX:
+            _track_cache.popitem(last=False)
+    return row
 
 
 def upsert_cached_track(
     url: str, file_path: str, title: str, duration: int, file_size: int
 ) -> None:
-    conn = _get_conn()
-    conn.execute(
-        "INSERT INTO audio_cache (url, file_path, title, duration, file_size) "
-        "VALUES (?, ?, ?, ?, ?) "
-        "ON CONFLICT(url) DO UPDATE SET "
-        "file_path=excluded.file_path, title=excluded.title, "
-        "duration=excluded.duration, file_size=excluded.file_size, "
-        "last_played=datetime('now')",
-        (url, file_path, title, duration, file_size),
-    )
-    conn.commit()
-
-
-def touch_cached_track(url: str) -> None:
-    conn = _get_conn()
-    conn.execute(
-        "UPDATE audio_cache SET last_played = datetime('now') WHERE url = ?",
-        (url,),
-    )
-    conn.commit()
+    with _write() as conn:
+        conn.execute(
+            "INSERT INTO audio_cache (url, file_path, title, duration, file_size) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET "
+            "file_path=excluded.file_path, title=excluded.title, "
+            "duration=excluded.duration, file_size=excluded.file_size, "
+            "last_played=datetime('now')",
+            (url, file_path, title, duration, file_size),
+        )
+    _invalidate_tracks((url,))
+
+
+def touch_cached_tracks(touches: list[tuple[float, str]]) -> None:
+    """Set last_played for many tracks from (unix_timestamp, url) pairs in one transaction."""
+    with _write() as conn:
+        conn.executemany(
+            "UPDATE audio_cache SET last_played = datetime(?, 'unixepoch') WHERE url = ?",
+            touches,
+        )
+    _invalidate_tracks(url for _, url in touches)
 
 
 def delete_cached_track(url: str) -> None:
-    conn = _get_conn()
-    conn.execute("DELETE FROM audio_cache WHERE url = ?", (url,))
-    conn.commit()
+    with _write() as conn:
+        conn.execute("DELETE FROM audio_cache WHERE url = ?", (url,))
+    _invalidate_tracks((url,))
 
 
-def get_all_cached_tracks() -> list:
+def get_cache_eviction_candidates(excess_bytes: int) -> list:
+    """Least-recently-played tracks whose combined size first covers excess_bytes."""
     conn = _get_conn()
     return conn.execute(
-        "SELECT * FROM audio_cache ORDER BY last_played ASC"
+        "SELECT url, file_path, file_size FROM ("
+        "  SELECT url, file_path, file_size, "
+        "  SUM(file_size) OVER (ORDER BY last_played ASC, id ASC) AS running "
+        "  FROM audio_cache"
+        ") WHERE running - file_size < ? ORDER BY running",
+        (excess_bytes,),
     ).fetchall()
 
 
@@ -237,25 +358,22 @@ def get_total_cache_size() -> int:
 
 def create_cached_playlist(guild_id: str, name: str, source_url: str) -> int:
     """Create or get existing cached playlist. Returns playlist id."""
-    conn = _get_conn()
-    existing = conn.execute(
-        "SELECT id FROM cached_playlists WHERE guild_id = ? AND name = ?",
-        (guild_id, name),
-    ).fetchone()
-    if existing:
-        return existing["id"]
-    cur = conn.execute(
-        "INSERT INTO cached_playlists (guild_id, name, source_url) VALUES (?, ?, ?)",
-        (guild_id, name, source_url),
-    )
-    conn.commit()
-    return cur.lastrowid
+    with _write() as conn:
+        # The no-op DO UPDATE makes RETURNING yield the existing row's id too
+        playlist_id = conn.execute(
+            "INSERT INTO cached_playlists (guild_id, name, source_url) VALUES (?, ?, ?) "
+            "ON CONFLICT(guild_id, name) DO UPDATE SET name = excluded.name "
+            "RETURNING id",
+            (guild_id, name, source_url),
+        ).fetchone()[0]
+    return playlist_id
 
 
 def get_cached_playlist(guild_id: str, name: str) -> Optional[sqlite3.Row]:
     conn = _get_conn()
     return conn.execute(
-        "SELECT * FROM cached_playlists WHERE guild_id = ? AND name = ?",
+        "SELECT id, guild_id, name, source_url FROM cached_playlists "
+        "WHERE guild_id = ? AND name = ?",
         (guild_id, name),
     ).fetchone()
 
@@ -263,44 +381,47 @@ def get_cached_playlist(guild_id: str, name: str) -> Optional[sqlite3.Row]:
 def list_cached_playlists(guild_id: str) -> list:
     conn = _get_conn()
     return conn.execute(
-        "SELECT cp.id, cp.name, cp.source_url, COUNT(t.id) AS track_count "
-        "FROM cached_playlists cp "
-        "LEFT JOIN cached_playlist_tracks t ON t.playlist_id = cp.id "
-        "WHERE cp.guild_id = ? "
-        "GROUP BY cp.id ORDER BY cp.name",
+        "SELECT cp.id, cp.name, cp.source_url, "
+        "(SELECT COUNT(*) FROM cached_playlist_tracks t WHERE t.playlist_id = cp.id) "
+        "AS track_count "
+        "FROM cached_playlists cp WHERE cp.guild_id = ? ORDER BY cp.name",
         (guild_id,),
     ).fetchall()
 
 
-def get_cached_playlist_tracks(playlist_id: int) -> list:
-    conn = _get_conn()
-    return conn.execute(
-        "SELECT * FROM cached_playlist_tracks WHERE playlist_id = ? ORDER BY position",
+def get_cached_playlist_tracks(
+    playlist_id: int, shuffle: bool = False
+) -> list[CachedPlaylistTrack]:
+    """Tracks in playlist order, or in random order (done by SQLite) if shuffle."""
+    return _fetch_as(
+        CachedPlaylistTrack,
+        "SELECT id, playlist_id, position, title, url, duration, file_path "
+        "FROM cached_playlist_tracks WHERE playlist_id = ? "
+        + ("ORDER BY RANDOM()" if shuffle else "ORDER BY position"),
         (playlist_id,),
-    ).fetchall()
+    )
 
 
 def get_cached_playlist_urls(playlist_id: int) -> set[str]:
     """Return the set of track URLs already cached for this playlist."""
-    conn = _get_conn()
-    rows = conn.execute(
+    cur = _get_conn().cursor()
+    cur.row_factory = None  # plain tuples; only the one column is needed
+    cur.execute(
         "SELECT url FROM cached_playlist_tracks WHERE playlist_id = ?",
         (playlist_id,),
-    ).fetchall()
-    return {r["url"] for r in rows}
+    )
+    return {url for (url,) in cur}
 
 
-def add_cached_playlist_track(
-    playlist_id: int, position: int, title: str, url: str, duration: int, file_path: str
-) -> None:
-    conn = _get_conn()
-    conn.execute(
-        "INSERT OR IGNORE INTO cached_playlist_tracks "
-        "(playlist_id, position, title, url, duration, file_path) "
-        "VALUES (?, ?, ?, ?, ?, ?)",
-        (playlist_id, position, title, url, duration, file_path),
-    )
-    conn.commit()
+def add_cached_playlist_tracks_bulk(rows: list[tuple]) -> None:
+    """Insert many (playlist_id, position, title, url, duration, file_path) rows in one transaction."""
+    with _write() as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO cached_playlist_tracks "
+            "(playlist_id, position, title, url, duration, file_path) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
 
 
 def get_next_cached_track_position(playlist_id: int) -> int:
@@ -314,10 +435,9 @@ def get_next_cached_track_position(playlist_id: int) -> int:
 
 
 def delete_cached_playlist(guild_id: str, name: str) -> bool:
-    conn = _get_conn()
-    deleted = conn.execute(
-        "DELETE FROM cached_playlists WHERE guild_id = ? AND name = ?",
-        (guild_id, name),
-    ).rowcount
-    conn.commit()
+    with _write() as conn:
+        deleted = conn.execute(
+            "DELETE FROM cached_playlists WHERE guild_id = ? AND name = ?",
+            (guild_id, name),
+        ).rowcount
     return bool(deleted)
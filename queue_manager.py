@@ -1,18 +1,61 @@
 import asyncio
 import random
 from collections import deque
+from itertools import islice
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Iterator, Optional
 import discord
 
+from utils import fmt_duration
 
-@dataclass
+
+def is_active(vc: Optional[discord.VoiceClient]) -> bool:
+    """True if the voice client has a song loaded, playing or paused."""
+    return vc is not None and (vc.is_playing() or vc.is_paused())
+
+
+@dataclass(slots=True)
 class SongEntry:
     title: str
     url: str           # canonical watch URL (re-resolved fresh at play time)
     duration: int      # seconds
     requester: discord.Member
     thumbnail: Optional[str] = None
+    duration_str: str = field(init=False, repr=False, compare=False)
+    # '/queue' line without the position prefix, rendered on first display
+    _rendered: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Formatted once; every embed and queue render reads this instead
+        self.duration_str = fmt_duration(self.duration)
+
+    def fill_missing(self, title: str, duration: int, thumbnail: Optional[str]) -> None:
+        """Fill in details left blank at enqueue time (e.g. fast-pathed URLs)."""
+        if self.title == self.url:
+            self.title = title
+        if not self.duration and duration:
+            self.duration = duration
+            self.duration_str = fmt_duration(duration)
+        if not self.thumbnail:
+            self.thumbnail = thumbnail or None
+        self._rendered = None
+
+    def queue_line(self) -> str:
+        """Return this entry's '/queue' line (minus its index), rendering it once."""
+        if self._rendered is None:
+            self._rendered = (
+                f"**{self.title}** [{self.duration_str}]"
+                f" — {self.requester.display_name}"
+            )
+        return self._rendered
+
+
+def _discard_prefetch_task(task: asyncio.Task) -> None:
+    """Cancel a prefetch (its result holds no resources once done)."""
+    if not task.done():
+        task.cancel()
+    elif not task.cancelled():
+        task.exception()  # mark a failure as retrieved
 
 
 class GuildQueue:
@@ -21,13 +64,22 @@ class GuildQueue:
         self.current: Optional[SongEntry] = None
         self.voice_client: Optional[discord.VoiceClient] = None
         self.now_playing_message: Optional[discord.Message] = None
+        self.now_playing_view: Optional[discord.ui.View] = None
         self.text_channel: Optional[discord.abc.Messageable] = None
         self._lock: asyncio.Lock = asyncio.Lock()
+        # Held for the whole of Music._play_next (dequeue, resolve, play)
+        self._play_lock: asyncio.Lock = asyncio.Lock()
+        # (entry, task resolving what to play) for the upcoming song
+        self.prefetched: Optional[tuple[SongEntry, asyncio.Task]] = None
 
     def add(self, entry: SongEntry) -> None:
         """Append to end of queue."""
         self._queue.append(entry)
 
+    def extend(self, entries: list[SongEntry]) -> None:
+        """Append many songs at once."""
+        self._queue.extend(entries)
+
     def add_next(self, entry: SongEntry) -> None:
         """Insert at position 0 — plays immediately after the current song."""
         self._queue.appendleft(entry)
@@ -38,23 +90,47 @@ class GuildQueue:
             return self._queue.popleft()
         return None
 
+    def peek_next(self) -> Optional[SongEntry]:
+        """Return the next song without removing it."""
+        return self._queue[0] if self._queue else None
+
+    def take_prefetched(self, entry: SongEntry) -> Optional[asyncio.Task]:
+        """Return the prefetch task if it was started for `entry`; otherwise discard it."""
+        prefetched, self.prefetched = self.prefetched, None
+        if prefetched is None:
+            return None
+        prefetched_entry, task = prefetched
+        if prefetched_entry is entry:
+            return task
+        _discard_prefetch_task(task)
+        return None
+
+    def discard_prefetch(self) -> None:
+        if self.prefetched is not None:
+            _discard_prefetch_task(self.prefetched[1])
+            self.prefetched = None
+
     def skip(self) -> None:
         """Stop current audio; the after= callback drives the next song."""
-        if self.voice_client and self.voice_client.is_playing():
+        if is_active(self.voice_client):
             self.voice_client.stop()
 
     def clear(self) -> None:
         self._queue.clear()
         self.current = None
+        self.discard_prefetch()
 
     def shuffle(self) -> None:
         """Randomly reorder the upcoming queue (does not affect the current song)."""
+        # deque indexing is O(n), so shuffle a list copy and refill in place
         items = list(self._queue)
         random.shuffle(items)
-        self._queue = deque(items)
+        self._queue.clear()
+        self._queue.extend(items)
 
-    def list_entries(self) -> list[SongEntry]:
-        return list(self._queue)
+    def iter_entries(self, limit: Optional[int] = None) -> Iterator[SongEntry]:
+        """Yield up to `limit` upcoming entries (all if None) without copying the queue."""
+        return islice(self._queue, limit)
 
     def __len__(self) -> int:
         return len(self._queue)
@@ -67,9 +143,10 @@ class QueueManager:
         self._guilds: dict[int, GuildQueue] = {}
 
     def get(self, guild_id: int) -> GuildQueue:
-        if guild_id not in self._guilds:
-            self._guilds[guild_id] = GuildQueue()
-        return self._guilds[guild_id]
+        gq = self._guilds.get(guild_id)
+        if gq is None:
+            gq = self._guilds[guild_id] = GuildQueue()
+        return gq
 
     def remove(self, guild_id: int) -> None:
         self._guilds.pop(guild_id, None)
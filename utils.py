@@ -0,0 +1,11 @@
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096)
+def fmt_duration(seconds: int) -> str:
+    """Format a duration in seconds as M:SS or H:MM:SS."""
+    minutes, secs = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
@@ -1,11 +1,30 @@
 import asyncio
+import copy
+import errno
+import functools
+import logging
+import multiprocessing
 import os
+import stat
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
 import discord
-import yt_dlp
+
+if TYPE_CHECKING:
+    import yt_dlp
 
 import cache_manager
 import database as db
 
+logger = logging.getLogger(__name__)
+
 _YTDL_OPTIONS = {
     "format": "bestaudio/best",
     "outtmpl": "%(extractor)s-%(id)s-%(title)s.%(ext)s",
@@ -19,6 +38,8 @@ _YTDL_OPTIONS = {
     "default_search": "scsearch",
     "source_address": "0.0.0.0",
     "geo_bypass": True,
+    # A stalled connection errors out instead of pinning a worker forever
+    "socket_timeout": 10,
 }
 
 FFMPEG_OPTIONS = {
@@ -34,72 +55,364 @@ LOCAL_FFMPEG_OPTIONS = {
     "options": "-vn",
 }
 
+# Audio source constructors with the options above bound once
+_stream_audio = functools.partial(discord.FFmpegPCMAudio, **FFMPEG_OPTIONS)
+_local_audio = functools.partial(discord.FFmpegPCMAudio, **LOCAL_FFMPEG_OPTIONS)
+
 _YTDL_PLAYLIST_OPTIONS = {**_YTDL_OPTIONS, "noplaylist": False, "ignoreerrors": True}
 
+# Lists playlist entries (url/id/title) without resolving each track
+_YTDL_FLAT_PLAYLIST_OPTIONS = {**_YTDL_PLAYLIST_OPTIONS, "extract_flat": "in_playlist"}
 
-def _extract_info(query: str) -> dict:
-    """Extract info via yt-dlp using SoundCloud search as default."""
-    data = yt_dlp.YoutubeDL(_YTDL_OPTIONS).extract_info(query, download=False)
+# Downloads prefer an Opus source: FFmpegExtractAudio then stream-copies it
+# into the .opus file instead of re-encoding. Other codecs are transcoded;
+# libopus is single-threaded, so a lower compression level keeps long
+# tracks from pinning a core for minutes (negligible loss at 96 kbps).
+_CACHE_DOWNLOAD_OPTIONS = {
+    **_YTDL_OPTIONS,
+    "format": "bestaudio[acodec=opus]/bestaudio/best",
+    "postprocessors": [{
+        "key": "FFmpegExtractAudio",
+        "preferredcodec": "opus",
+        "preferredquality": "96",
+    }],
+    "postprocessor_args": {"extractaudio": ["-compression_level", "5"]},
+}
+
+
+# yt-dlp calls get their own threads so a slow playlist extraction can't
+# starve the loop's default executor
+YTDL_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ytdl")
+
+# Metadata lookups run in worker processes: yt-dlp extraction is mostly
+# GIL-bound Python (page parsing, signature JS), which otherwise stalls the
+# event loop and the voice sender thread. Workers return plain dicts only.
+def _init_extract_worker() -> None:
+    """Build a worker's YoutubeDL instances before its first lookup arrives."""
+    _shared_ydl("info", _YTDL_OPTIONS)
+    _shared_ydl("flat", _YTDL_FLAT_PLAYLIST_OPTIONS)
+
+
+_extract_pool: ProcessPoolExecutor | None = None
+
+
+def _get_extract_pool() -> ProcessPoolExecutor:
+    """The metadata worker pool, started on first use."""
+    global _extract_pool
+    if _extract_pool is None:
+        _extract_pool = ProcessPoolExecutor(
+            max_workers=min(4, os.cpu_count() or 1),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_extract_worker,
+        )
+    return _extract_pool
+
+
+async def _run_extract(fn, *args):
+    """
+    Run a worker function in the metadata pool. If a worker died and broke
+    the pool, replace it for later calls and run this one in YTDL_POOL.
+    """
+    global _extract_pool
+    loop = asyncio.get_running_loop()
+    pool = _get_extract_pool()
+    try:
+        return await loop.run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        logger.warning("Metadata worker pool broke; starting a new one")
+        if _extract_pool is pool:
+            _extract_pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+        return await loop.run_in_executor(YTDL_POOL, fn, *args)
+
+
+async def _lookup_metadata(query: str) -> dict:
+    async with RESOLVE_SEMAPHORE:
+        return await _run_extract(_extract_metadata, query)
+
+
+def shutdown_pools() -> None:
+    """Stop the yt-dlp thread and process pools without waiting on them."""
+    YTDL_POOL.shutdown(wait=False, cancel_futures=True)
+    if _extract_pool is not None:
+        _extract_pool.shutdown(wait=False, cancel_futures=True)
+
+# Deadlines for lookups awaited by a user; asyncio can't stop the worker
+# itself, so socket_timeout above is what actually frees it.
+EXTRACT_TIMEOUT = 15  # seconds
+PLAYLIST_TIMEOUT = 60  # seconds; large playlists are listed in pages
+
+# Caps concurrent yt-dlp extractions across all guilds so bursts don't
+# exhaust file descriptors or trip the providers' rate limits. Held only
+# around the extraction itself, never across a download.
+RESOLVE_SEMAPHORE = asyncio.BoundedSemaphore(max(4, os.cpu_count() or 1))
+
+# Caps cache-miss downloads started by playback (/cache has its own limit).
+# When every slot is busy, a song streams instead of waiting for one.
+PLAY_DOWNLOAD_SEMAPHORE = asyncio.BoundedSemaphore(4)
+
+
+# Enqueue-time metadata (title/url/duration/thumbnail) keyed by query, as
+# (expires_at, meta). Holds no CDN URLs. A URL always names the same track;
+# search results drift, so they expire sooner.
+_META_CACHE_MAX = 512
+_META_TTL_URL = 24 * 3600  # seconds
+_META_TTL_SEARCH = 600  # seconds
+_meta_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+# Lookups in flight, so concurrent requests for one query share an extraction
+_meta_inflight: dict[str, asyncio.Future] = {}
+# Cache-miss downloads in flight, keyed by the raw query (which names the
+# file), so concurrent plays of one track download it once
+_download_inflight: dict[str, asyncio.Task] = {}
+
+# Share/tracking parameters that don't change which track a URL points to
+_TRACKING_PARAMS = frozenset({"si", "feature", "fbclid", "gclid", "ref"})
+
+# Query prefixes that name a specific page. Search prefixes (ytsearch:,
+# scsearch:) deliberately aren't here: their results drift like plain text.
+_URL_PREFIXES = ("http://", "https://", "www.")
+
+
+def _is_url(query: str) -> bool:
+    return query.startswith(_URL_PREFIXES)
+
+
+def _looks_like_path(query: str) -> bool:
+    """True for queries that could name a local file (absolute, ./, ../ or ~)."""
+    return os.path.isabs(query) or query.startswith(("./", "../", "~"))
+
+
+def _is_local_file(path: str) -> bool:
+    """Like os.path.isfile, but logs stat failures other than a missing path."""
+    try:
+        st = os.stat(os.path.expanduser(path))
+    except OSError as exc:
+        if exc.errno not in (errno.ENOENT, errno.ENOTDIR, errno.ENAMETOOLONG):
+            logger.warning("Could not stat local file %s: %s", path, exc)
+        return False
+    return stat.S_ISREG(st.st_mode)
+
+
+def _meta_cache_key(query: str) -> str:
+    """Normalize a query for the metadata cache (URLs are case-sensitive)."""
+    query = query.strip()
+    if not _is_url(query):
+        return query.lower()
+    if query.startswith("www."):
+        # yt-dlp adds the scheme itself; key it like the full URL
+        query = "https://" + query
+    parts = urlsplit(query)
+    params = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k not in _TRACKING_PARAMS and not k.startswith("utm_")
+    ]
+    return urlunsplit(parts._replace(query=urlencode(params), fragment=""))
+
+
+# YoutubeDL instances are reused instead of rebuilt per query, which keeps
+# extractor setup, cookies and pooled connections. They aren't thread-safe,
+# so each executor thread gets its own.
+_ydl_local = threading.local()
+
+
+def _shared_ydl(name: str, opts: dict) -> "yt_dlp.YoutubeDL":
+    """Return this thread's YoutubeDL for the given options set."""
+    ydl = getattr(_ydl_local, name, None)
+    if ydl is None:
+        # Imported on first use: yt-dlp is slow to load and the bot doesn't
+        # need it until something is played
+        import yt_dlp
+        # YoutubeDL keeps (and normalizes in place) the dict it's given, so
+        # each instance needs its own copy or threads share one outtmpl
+        ydl = yt_dlp.YoutubeDL(copy.deepcopy(opts))
+        setattr(_ydl_local, name, ydl)
+    return ydl
+
+
+def _single_track(data: dict | None, query: str) -> dict:
+    """
+    Unwrap a search result to its first track. `entries` may be a lazy
+    generator, so only the first item is pulled.
+    """
     if data is None:
         raise ValueError(f"Could not retrieve audio for: {query}")
-    return data
+    entries = data.get("entries")
+    if entries is None:
+        return data
+    first = next(iter(entries), None)
+    if first is None:
+        raise ValueError(f"No results for: {query}")
+    return first
+
+
+def _extract_info(query: str) -> dict:
+    """Extract a single track's info via yt-dlp using SoundCloud search as default."""
+    data = _shared_ydl("info", _YTDL_OPTIONS).extract_info(query, download=False)
+    return _single_track(data, query)
+
+
+def _download_ydl(outtmpl: str) -> "yt_dlp.YoutubeDL":
+    """This thread's download YoutubeDL, pointed at `outtmpl` for the next call."""
+    ydl = _shared_ydl("download", _CACHE_DOWNLOAD_OPTIONS)
+    # YoutubeDL normalizes outtmpl to a per-type dict in __init__; only the
+    # media filename changes between tracks. The dict is this thread's own.
+    ydl.params["outtmpl"]["default"] = outtmpl
+    return ydl
 
 
 def _extract_and_download(query: str) -> dict:
-    """Extract info AND download audio to the cache directory."""
+    """
+    Extract info AND download audio to the cache directory.
+    `_downloaded_file` is the cached path, or None if nothing landed on disk.
+    """
     file_hash = cache_manager.url_to_hash(query)
     outtmpl = str(cache_manager.CACHE_DIR / f"{file_hash}.%(ext)s")
 
-    opts = {
-        **_YTDL_OPTIONS,
-        "outtmpl": outtmpl,
-        "postprocessors": [{
-            "key": "FFmpegExtractAudio",
-            "preferredcodec": "opus",
-            "preferredquality": "96",
-        }],
-    }
-
-    data = yt_dlp.YoutubeDL(opts).extract_info(query, download=True)
-    if data is None:
-        raise ValueError(f"Could not retrieve audio for: {query}")
+    data = _download_ydl(outtmpl).extract_info(query, download=True)
+    data = _single_track(data, query)
 
     # yt-dlp may change extension after post-processing
     expected_path = str(cache_manager.CACHE_DIR / f"{file_hash}.opus")
-    data["_downloaded_file"] = expected_path
+    # Checked here so the event loop never stats the file
+    data["_downloaded_file"] = expected_path if os.path.isfile(expected_path) else None
     return data
 
 
-def _download_single_track(url: str, output_path: str) -> dict:
-    """Download and encode a single track to a specific opus file path."""
+def _download_single_track(url: str, output_path: str, info: dict | None = None) -> dict:
+    """
+    Download and encode a single track to a specific opus file path.
+    Returns its title, duration and `_downloaded_file` (None if missing).
+    If `info` (the entry from a playlist extraction) is given, it is
+    processed directly so the track isn't extracted a second time; a fresh
+    extraction is only done if that fails (e.g. expired stream URLs).
+    """
+    from yt_dlp.utils import DownloadError
+
     # Strip extension — yt-dlp adds it via postprocessor
     base = output_path.rsplit(".", 1)[0] if "." in output_path else output_path
 
-    opts = {
-        **_YTDL_OPTIONS,
-        "outtmpl": base + ".%(ext)s",
-        "postprocessors": [{
-            "key": "FFmpegExtractAudio",
-            "preferredcodec": "opus",
-            "preferredquality": "96",
-        }],
-    }
+    ydl = _download_ydl(base + ".%(ext)s")
 
-    data = yt_dlp.YoutubeDL(opts).extract_info(url, download=True)
+    data = None
+    if info is not None:
+        try:
+            data = ydl.process_ie_result(dict(info), download=True)
+        except DownloadError as exc:
+            logger.info("Reusing playlist info failed, re-extracting %s: %s", url, exc)
+    if data is None:
+        try:
+            data = ydl.extract_info(url, download=True)
+        except DownloadError as exc:
+            # Its exc_info traceback can't be pickled back to the parent
+            raise ValueError(str(exc)) from None
     if data is None:
         raise ValueError(f"Could not retrieve audio for: {url}")
-    data["_downloaded_file"] = base + ".opus"
-    return data
+    path = base + ".opus"
+    # Runs in the download pool: return only what the caller needs, not the
+    # full info dict (formats, internals) pickled back per track
+    return {
+        "title": data.get("title"),
+        "duration": int(data.get("duration") or 0),
+        "_downloaded_file": path if os.path.isfile(path) else None,
+    }
 
 
-def _extract_playlist(url: str) -> dict:
-    """Extract info with playlist support enabled."""
-    data = yt_dlp.YoutubeDL(_YTDL_PLAYLIST_OPTIONS).extract_info(url, download=False)
+def _extract_metadata(query: str) -> dict:
+    """Title/canonical URL/duration/thumbnail for a query (extract pool worker)."""
+    from yt_dlp.utils import DownloadError
+    try:
+        data = _extract_info(query)
+    except DownloadError as exc:
+        # Its exc_info traceback can't be pickled back to the parent
+        raise ValueError(str(exc)) from None
+    return {
+        "title": data.get("title", "Unknown"),
+        "url": data.get("webpage_url") or data.get("url"),
+        "duration": int(data.get("duration") or 0),
+        "thumbnail": data.get("thumbnail", ""),
+    }
+
+
+def _track_from_entry(entry: dict | None) -> dict | None:
+    """
+    Reduce a flat playlist entry to a title/url/duration/thumbnail dict.
+    Fields the listing lacks are left blank (title falls back to the URL)
+    and filled in at play time. None if the entry has no usable URL.
+    """
+    if entry is None:
+        return None
+    track_url = entry.get("webpage_url") or entry.get("url")
+    if not track_url and entry.get("ie_key") == "Youtube" and entry.get("id"):
+        track_url = f"https://www.youtube.com/watch?v={entry['id']}"
+    if not track_url:
+        return None
+    thumbnails = entry.get("thumbnails") or []
+    return {
+        "title": entry.get("title") or track_url,
+        "url": track_url,
+        "duration": int(entry.get("duration") or 0),
+        "thumbnail": entry.get("thumbnail")
+        or (thumbnails[-1].get("url") if thumbnails else ""),
+    }
+
+
+def _extract_playlist_tracks(url: str) -> list[dict]:
+    """Flat-list a whole playlist as track dicts (extract pool worker)."""
+    from yt_dlp.utils import DownloadError
+    try:
+        entries = _extract_playlist_flat(url).get("entries") or []
+    except DownloadError as exc:
+        # Its exc_info traceback can't be pickled back to the parent
+        raise ValueError(str(exc)) from None
+    return [t for e in entries if (t := _track_from_entry(e))]
+
+
+def _iter_playlist_tracks(url: str) -> Iterator[dict]:
+    """
+    Yield track dicts while yt-dlp pages through a playlist listing
+    (process=False keeps its entries a lazy generator).
+    """
+    ydl = _shared_ydl("flat", _YTDL_FLAT_PLAYLIST_OPTIONS)
+    info = ydl.extract_info(url, download=False, process=False)
+    # e.g. a watch URL with list= resolves to the playlist page first
+    while info and info.get("_type") in ("url", "url_transparent"):
+        info = ydl.extract_info(
+            info["url"], download=False, process=False, ie_key=info.get("ie_key")
+        )
+    if info is None:
+        raise ValueError(f"Could not retrieve playlist for: {url}")
+    for entry in info.get("entries") or []:
+        if track := _track_from_entry(entry):
+            yield track
+
+
+def _extract_playlist_flat(url: str) -> dict:
+    """Extract a playlist's entries without per-track metadata requests."""
+    data = _shared_ydl("flat", _YTDL_FLAT_PLAYLIST_OPTIONS).extract_info(
+        url, download=False
+    )
     if data is None:
         raise ValueError(f"Could not retrieve playlist for: {url}")
     return data
 
 
+async def _download_to_cache(query: str) -> dict:
+    """Download a track into the audio cache and index it."""
+    loop = asyncio.get_running_loop()
+    async with PLAY_DOWNLOAD_SEMAPHORE:
+        data = await loop.run_in_executor(YTDL_POOL, _extract_and_download, query)
+    if data["_downloaded_file"]:
+        # Indexing may trigger an eviction pass; keep it off the loop
+        await asyncio.to_thread(
+            cache_manager.register_cached_file,
+            url=data.get("webpage_url") or query,
+            file_path=data["_downloaded_file"],
+            title=data.get("title", "Unknown"),
+            duration=int(data.get("duration") or 0),
+        )
+    return data
+
+
 class YTDLSource(discord.PCMVolumeTransformer):
     def __init__(
         self,
@@ -118,139 +431,191 @@ class YTDLSource(discord.PCMVolumeTransformer):
         self.uploader: str = data.get("uploader", "Unknown")
 
     @classmethod
-    async def from_query(
-        cls,
-        query: str,
-        *,
-        loop: asyncio.AbstractEventLoop = None,
-    ) -> "YTDLSource":
+    def from_resolved(cls, data: dict) -> "YTDLSource":
+        """
+        Build the audio source for a resolve() result. This starts ffmpeg,
+        so call it only when the song is about to play.
+        """
+        audio = _local_audio if data["_local"] else _stream_audio
+        return cls(audio(data["url"]), data=data)
+
+    @classmethod
+    async def resolve(cls, query: str) -> dict:
         """
-        Resolve a search query or URL to a playable YTDLSource.
+        Find what to play for a search query or URL, without starting ffmpeg.
         Checks the local audio cache first. On a miss, downloads and caches
         the file for future plays. Falls back to streaming on any error.
+        The result's "url" is a local path if "_local" is set, else a
+        stream URL.
         """
-        loop = loop or asyncio.get_event_loop()
-
-        # 0. Direct local file path — used by /playlocal
-        if os.path.isfile(query):
-            print(f"[playback] LOCAL FILE: {query}")
-            return cls(
-                discord.FFmpegPCMAudio(query, **LOCAL_FFMPEG_OPTIONS),
-                data={
-                    "url": query,
-                    "webpage_url": query,
-                    "title": os.path.basename(query),
-                    "duration": 0,
-                    "thumbnail": "",
-                    "uploader": "",
-                },
-            )
+        loop = asyncio.get_running_loop()
+
+        # 0. Direct local file path — used by /playlocal. URLs and searches
+        # skip the stat; paths stat off the loop in case the disk is slow
+        if _looks_like_path(query) and await loop.run_in_executor(
+            None, _is_local_file, query
+        ):
+            logger.info("LOCAL FILE: %s", query)
+            return {
+                "url": os.path.expanduser(query),
+                "webpage_url": query,
+                "title": os.path.basename(query),
+                "duration": 0,
+                "thumbnail": "",
+                "uploader": "",
+                "_local": True,
+            }
 
         # 1. Cache hit — play from local file
         cached_path = cache_manager.get_cached_path(query)
         if cached_path:
             row = db.get_cached_track(query)
-            print(f"[playback] CACHE HIT: '{row['title']}' -> {cached_path}")
-            data = {
+            logger.info("CACHE HIT: %r -> %s", row["title"], cached_path)
+            return {
                 "url": cached_path,
                 "webpage_url": query,
                 "title": row["title"],
                 "duration": row["duration"],
                 "thumbnail": "",
                 "uploader": "",
+                "_local": True,
             }
-            return cls(
-                discord.FFmpegPCMAudio(cached_path, **LOCAL_FFMPEG_OPTIONS),
-                data=data,
-            )
 
-        # 2. Cache miss — download to cache
-        try:
-            data = await loop.run_in_executor(
-                None, lambda: _extract_and_download(query)
-            )
-            if "entries" in data:
-                data = data["entries"][0]
-
-            downloaded_file = data["_downloaded_file"]
-            if os.path.isfile(downloaded_file):
-                cache_manager.register_cached_file(
-                    url=data.get("webpage_url") or query,
-                    file_path=downloaded_file,
-                    title=data.get("title", "Unknown"),
-                    duration=int(data.get("duration") or 0),
-                )
-                data["url"] = downloaded_file
-                print(f"[playback] DOWNLOADED & CACHED: '{data.get('title', 'Unknown')}' -> {downloaded_file}")
-                return cls(
-                    discord.FFmpegPCMAudio(downloaded_file, **LOCAL_FFMPEG_OPTIONS),
-                    data=data,
-                )
-        except Exception as exc:
-            print(f"[playback] Download failed, falling back to streaming: {exc}")
+        # 2. Cache miss — download to cache, unless playback downloads are
+        # all busy (then stream now rather than queue behind them)
+        task = _download_inflight.get(query)
+        if task is None and not PLAY_DOWNLOAD_SEMAPHORE.locked():
+            task = asyncio.create_task(_download_to_cache(query))
+            _download_inflight[query] = task
+            task.add_done_callback(lambda _: _download_inflight.pop(query, None))
+        if task is not None:
+            try:
+                # Shielded so a discarded prefetch doesn't cancel a shared download
+                data = dict(await asyncio.shield(task))
+                downloaded_file = data["_downloaded_file"]
+                if downloaded_file:
+                    data["url"] = downloaded_file
+                    data["_local"] = True
+                    logger.info(
+                        "DOWNLOADED & CACHED: %r -> %s",
+                        data.get("title", "Unknown"), downloaded_file,
+                    )
+                    return data
+            except Exception as exc:
+                logger.warning("Download failed, falling back to streaming: %s", exc)
 
         # 3. Fallback — stream from CDN
-        data = await loop.run_in_executor(
-            None, lambda: _extract_info(query)
-        )
-        if "entries" in data:
-            data = data["entries"][0]
-        print(f"[playback] STREAMING: '{data.get('title', 'Unknown')}' from CDN")
-        return cls(
-            discord.FFmpegPCMAudio(data["url"], **FFMPEG_OPTIONS),
-            data=data,
-        )
+        async with RESOLVE_SEMAPHORE:
+            data = await asyncio.wait_for(
+                loop.run_in_executor(YTDL_POOL, _extract_info, query), EXTRACT_TIMEOUT
+            )
+        logger.info("STREAMING: %r from CDN", data.get("title", "Unknown"))
+        return {**data, "_local": False}
 
     @classmethod
-    async def fetch_metadata_only(
-        cls,
-        query: str,
-        loop: asyncio.AbstractEventLoop = None,
-    ) -> dict:
+    async def fetch_metadata_only(cls, query: str) -> dict:
         """
         Resolve title, canonical URL, duration and thumbnail without creating
         an audio source. Use this at enqueue time; re-resolve at play time via
-        from_query() to keep CDN URLs fresh.
+        resolve() to keep CDN URLs fresh.
         """
-        loop = loop or asyncio.get_event_loop()
-        data = await loop.run_in_executor(
-            None,
-            lambda: _extract_info(query),
-        )
-        if "entries" in data:
-            data = data["entries"][0]
-        return {
-            "title": data.get("title", "Unknown"),
-            "url": data.get("webpage_url") or data.get("url"),
-            "duration": int(data.get("duration") or 0),
-            "thumbnail": data.get("thumbnail", ""),
-        }
+        key = _meta_cache_key(query)
+        hit = _meta_cache.get(key)
+        if hit and time.monotonic() < hit[0]:
+            _meta_cache.move_to_end(key)
+            return dict(hit[1])
+
+        fut = _meta_inflight.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(_lookup_metadata(query))
+            _meta_inflight[key] = fut
+            fut.add_done_callback(lambda _: _meta_inflight.pop(key, None))
+        # Shielded so one cancelled or timed-out caller doesn't fail the others
+        try:
+            meta = await asyncio.wait_for(asyncio.shield(fut), EXTRACT_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise ValueError(f"Timed out looking up: {query}") from None
+
+        ttl = _META_TTL_URL if _is_url(key) else _META_TTL_SEARCH
+        _meta_cache[key] = (time.monotonic() + ttl, meta)
+        _meta_cache.move_to_end(key)
+        while len(_meta_cache) > _META_CACHE_MAX:
+            _meta_cache.popitem(last=False)
+        return dict(meta)
 
     @classmethod
-    async def fetch_playlist_metadata(
+    async def resolve_many(
         cls,
-        url: str,
-        loop: asyncio.AbstractEventLoop = None,
-    ) -> list[dict]:
+        queries: list[str],
+        *,
+        concurrency: int = 4,
+    ) -> list[dict | None]:
         """
-        Extract metadata for every track in a playlist URL.
-        Returns a list of dicts with title/url/duration/thumbnail.
-        Skips entries that failed to resolve (private, geo-blocked, etc.).
+        fetch_metadata_only() for several queries at once, at most
+        `concurrency` in flight. Results line up with `queries`; a query
+        that fails to resolve gets None.
         """
-        loop = loop or asyncio.get_event_loop()
-        data = await loop.run_in_executor(
-            None,
-            lambda: _extract_playlist(url),
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(query: str) -> dict:
+            async with sem:
+                return await cls.fetch_metadata_only(query)
+
+        results = await asyncio.gather(
+            *(one(q) for q in queries), return_exceptions=True
         )
-        entries = data.get("entries") or []
-        results = []
-        for entry in entries:
-            if entry is None:
-                continue
-            results.append({
-                "title": entry.get("title", "Unknown"),
-                "url": entry.get("webpage_url") or entry.get("url"),
-                "duration": int(entry.get("duration") or 0),
-                "thumbnail": entry.get("thumbnail", ""),
-            })
-        return results
+        return [None if isinstance(r, BaseException) else r for r in results]
+
+    @classmethod
+    async def iter_playlist_metadata(cls, url: str) -> AsyncIterator[dict]:
+        """
+        Yield title/url/duration/thumbnail dicts as the playlist listing
+        arrives, so callers can start on the first tracks while later pages
+        are still loading. Raises ValueError if listing fails or stalls.
+        """
+        loop = asyncio.get_running_loop()
+        items: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+
+        def produce() -> None:
+            end = None  # sentinel: listing finished
+            try:
+                for track in _iter_playlist_tracks(url):
+                    if stop.is_set():
+                        return
+                    loop.call_soon_threadsafe(items.put_nowait, track)
+            except ValueError as exc:
+                end = exc
+            except Exception as exc:
+                end = ValueError(f"Could not retrieve playlist for: {url} ({exc})")
+            loop.call_soon_threadsafe(items.put_nowait, end)
+
+        loop.run_in_executor(YTDL_POOL, produce)
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(items.get(), PLAYLIST_TIMEOUT)
+                except asyncio.TimeoutError:
+                    raise ValueError(f"Timed out listing playlist: {url}") from None
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Consumer gone (done, failed or cancelled): stop paging
+            stop.set()
+
+    @classmethod
+    async def fetch_playlist_metadata(cls, url: str) -> list[dict]:
+        """
+        List the tracks in a playlist URL from a single flat extraction.
+        Returns a list of dicts with title/url/duration/thumbnail.
+        """
+        try:
+            return await asyncio.wait_for(
+                _run_extract(_extract_playlist_tracks, url),
+                PLAYLIST_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            raise ValueError(f"Timed out listing playlist: {url}") from None